@@ -0,0 +1,293 @@
+"""
+Headless command line interface for the simulator.
+
+    python -m backend run   program.hex [--input 0x0A] [--input-at 5000:0x0A] [--max-steps 1000]
+    python -m backend trace program.hex [--micro]
+    python -m backend bench program.hex [--engine macro] [--instructions 100000]
+    python -m backend dump  program.hex [--steps 10]
+    python -m backend analyze program.hex
+    python -m backend startup [--runs 20] [--record startup.jsonl]
+
+This module must stay importable without PyQt5, and everything beyond argparse
+is imported lazily inside the command functions so that `python -m backend`
+starts as fast as the interpreter allows.
+"""
+import argparse
+import sys
+
+DEFAULT_MAX_STEPS = 1000
+
+
+def _int(text: str) -> int:
+    """Accepts decimal, 0x.. hex and 0b.. binary literals."""
+    return int(text, 0)
+
+
+def load_program_file(path: str) -> list:
+    """
+    Reads a program image.
+    .bin files are raw bytes; anything else is parsed as hex text, where bytes
+    are separated by whitespace or commas and '#' starts a comment.
+    """
+    if path.endswith(".bin"):
+        with open(path, "rb") as f:
+            return list(f.read())
+
+    program = []
+    with open(path) as f:
+        for line in f:
+            line = line.split("#", 1)[0].replace(",", " ")
+            for token in line.split():
+                if token.lower().startswith("0x"):
+                    token = token[2:]
+                value = int(token, 16)
+                if not 0 <= value <= 0xFF:
+                    raise ValueError(f"{path}: byte out of range: {token}")
+                program.append(value)
+    return program
+
+
+def _make_computer(args):
+    from .core.computer import Computer
+
+    computer = Computer(args.ram_size)
+    computer.load_program(load_program_file(args.program), args.start)
+    computer.cpu.input_device_val = args.input & 0xFF
+    for at, value in args.input_at:
+        computer.cpu.scheduler.schedule_input(at, value)
+    for at, period in args.timer:
+        computer.cpu.scheduler.schedule_timer(at, period)
+    return computer
+
+
+def _event(text: str) -> tuple:
+    """CYCLE:VALUE (input events) or CYCLE[:PERIOD] (timers)."""
+    at, _, value = text.partition(":")
+    return _int(at), _int(value) if value else 0
+
+
+def _format_registers(registers: dict) -> str:
+    return " ".join(f"{name}={value:02X}" for name, value in registers.items())
+
+
+def _hexdump(memory, start=0, end=None) -> str:
+    end = len(memory) if end is None else end
+    lines = []
+    for base in range(start - start % 16, end, 16):
+        row = memory[base:min(base + 16, end)]
+        lines.append(f"{base:04X}: " + " ".join(f"{b:02X}" for b in row))
+    return "\n".join(lines)
+
+
+def cmd_run(args) -> int:
+    computer = _make_computer(args)
+    if args.cache:
+        from .core.result_cache import ResultCache
+
+        cache = ResultCache(disk_dir=args.cache)
+        stats = cache.run(computer, args.max_steps, args.max_cycles)
+        print(f"cache: {'hit' if cache.hits else 'miss'}")
+    else:
+        stats = computer.run(args.max_steps, args.max_cycles)
+
+    print(f"instructions: {stats['instructions']}")
+    print(f"cycles: {stats['cycles']} (skipped idle: {stats['skipped_cycles']})")
+    print(f"stop: {stats['reason']}")
+    print(f"halted: {computer.cpu.halted}")
+    print(f"registers: {_format_registers(computer.cpu.rf.read_all())}")
+    print(f"output: {' '.join(f'{v:02X}' for v in computer.cpu.output)}")
+    return 0 if computer.cpu.halted else 2
+
+
+def cmd_trace(args) -> int:
+    computer = _make_computer(args)
+    decode = computer.cpu.control_unit.decode
+    for step in range(args.max_steps):
+        if computer.cpu.halted:
+            break
+        if computer.cpu.waiting:
+            before = computer.cpu.cycles
+            computer.run_single_macro_step()
+            if computer.cpu.waiting:
+                print(f"#{step:<5} waiting, no pending events")
+                break
+            print(f"#{step:<5} wait: cycle {before} -> {computer.cpu.cycles}")
+            continue
+        pc = computer.cpu.rf.PC.read()
+        instruction = computer.ram.read(pc)
+        name = decode(instruction)['name']
+        print(f"#{step:<5} PC={pc:02X} {instruction:02X} {name:<4}", end="")
+        if args.micro:
+            print()
+            for t, state in enumerate(computer.get_micro_step_generator()):
+                comps = ",".join(sorted(state["active_components"]))
+                print(f"    T{t}: {_format_registers(state['registers'])}  [{comps}]")
+        else:
+            computer.run_single_macro_step()
+            print(f"  -> {_format_registers(computer.cpu.rf.read_all())}")
+    print(f"halted: {computer.cpu.halted}")
+    return 0
+
+
+def cmd_bench(args) -> int:
+    import time
+    from .core import savestate
+
+    computer = _make_computer(args)
+    initial_state = computer.to_bytes()
+    if args.engine == "micro":
+        def step():
+            for _ in computer.get_micro_step_generator():
+                pass
+    else:
+        step = computer.run_single_macro_step
+
+    start = time.perf_counter()
+    for _ in range(args.instructions):
+        cpu = computer.cpu
+        if cpu.halted or (cpu.waiting and not len(cpu.scheduler)):
+            # Restart the program so the benchmark measures execution, not a stopped CPU
+            savestate.loads(initial_state, computer)
+        step()
+    elapsed = time.perf_counter() - start
+
+    rate = args.instructions / elapsed if elapsed else float("inf")
+    print(f"engine: {args.engine}")
+    print(f"instructions: {args.instructions}")
+    print(f"elapsed: {elapsed:.4f} s")
+    print(f"rate: {rate:,.0f} instr/s")
+    return 0
+
+
+def cmd_dump(args) -> int:
+    computer = _make_computer(args)
+    for _ in range(args.steps):
+        if computer.cpu.halted:
+            break
+        computer.run_single_macro_step()
+    print(f"registers: {_format_registers(computer.cpu.rf.read_all())}")
+    print(f"halted: {computer.cpu.halted}")
+    end = computer.ram.size if args.all else min(args.length, computer.ram.size)
+    print(_hexdump(computer.ram.memory, 0, end))
+    return 0
+
+
+def cmd_analyze(args) -> int:
+    from .core.analysis import analyze
+
+    computer = _make_computer(args)
+    analysis = analyze(computer.ram.memory, computer.cpu.rf.PC.read())
+    for block in analysis.blocks.values():
+        targets = ", ".join(f"{s:02X}" for s in block.successors) or ("HALT" if block.halts else "-")
+        print(f"block {block.start:02X}-{block.end:02X} -> {targets}")
+    for name, value in analysis.summary().items():
+        print(f"{name}: {value}")
+    return 0
+
+
+def cmd_startup(args) -> int:
+    """
+    Measures cold-start time in fresh interpreters, twice:
+        version  `python -m backend --version` (argparse exits before any backend import)
+        run      `python -m backend run` of a one-byte HALT program, which pays for
+                 importing backend.core the way a scripting loop does
+    With --record the result is appended as a JSON line so it can be tracked over time.
+    """
+    import json
+    import os
+    import statistics
+    import subprocess
+    import tempfile
+    import time
+
+    def measure(command):
+        samples = []
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            subprocess.run(command, check=True, stdout=subprocess.DEVNULL)
+            samples.append((time.perf_counter() - start) * 1000)
+        return {
+            "median_ms": round(statistics.median(samples), 2),
+            "min_ms": round(min(samples), 2),
+            "max_ms": round(max(samples), 2),
+        }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        program = os.path.join(tmp, "halt.hex")
+        with open(program, "w") as f:
+            f.write("F0\n")
+        result = {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "runs": args.runs,
+            "version": measure([sys.executable, "-m", "backend", "--version"]),
+            "run": measure([sys.executable, "-m", "backend", "run", program]),
+        }
+    print(json.dumps(result))
+    if args.record:
+        with open(args.record, "a") as f:
+            f.write(json.dumps(result) + "\n")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m backend", description="projectCAS headless simulator")
+    parser.add_argument("--version", action="version", version="projectCAS backend 1")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    def add_program_args(p):
+        p.add_argument("program", help="program image (.bin raw bytes, otherwise hex text)")
+        p.add_argument("--start", type=_int, default=0, help="load address")
+        p.add_argument("--input", type=_int, default=0, help="input device value")
+        p.add_argument("--ram-size", type=_int, default=256)
+        p.add_argument("--input-at", type=_event, action="append", default=[], metavar="CYCLE:VALUE",
+                       help="schedule an input-device value arriving at CYCLE (repeatable)")
+        p.add_argument("--timer", type=_event, action="append", default=[], metavar="CYCLE[:PERIOD]",
+                       help="schedule a (periodic) timer event (repeatable)")
+
+    p = sub.add_parser("run", help="run until HALT and print the final state")
+    add_program_args(p)
+    p.add_argument("--max-steps", type=_int, default=DEFAULT_MAX_STEPS, help="instruction budget")
+    p.add_argument("--max-cycles", type=_int, default=None, help="cycle budget")
+    p.add_argument("--cache", metavar="DIR", help="reuse results of identical runs stored in DIR")
+    p.set_defaults(func=cmd_run)
+
+    p = sub.add_parser("trace", help="print every instruction (or micro-step) executed")
+    add_program_args(p)
+    p.add_argument("--max-steps", type=_int, default=DEFAULT_MAX_STEPS)
+    p.add_argument("--micro", action="store_true", help="trace micro-steps via the GUI generator")
+    p.set_defaults(func=cmd_trace)
+
+    p = sub.add_parser("bench", help="measure instructions per second")
+    add_program_args(p)
+    p.add_argument("--engine", choices=("macro", "micro"), default="macro")
+    p.add_argument("--instructions", type=_int, default=100000)
+    p.set_defaults(func=cmd_bench)
+
+    p = sub.add_parser("dump", help="hex dump RAM after loading (and optionally running)")
+    add_program_args(p)
+    p.add_argument("--steps", type=_int, default=0, help="instructions to execute before dumping")
+    p.add_argument("--length", type=_int, default=64, help="bytes to dump")
+    p.add_argument("--all", action="store_true", help="dump the whole RAM")
+    p.set_defaults(func=cmd_dump)
+
+    p = sub.add_parser("analyze", help="print the control-flow graph and code/data classification")
+    add_program_args(p)
+    p.set_defaults(func=cmd_analyze)
+
+    p = sub.add_parser("startup", help="measure cold-start time of --version and of a minimal run")
+    p.add_argument("--runs", type=_int, default=20)
+    p.add_argument("--record", metavar="FILE", help="append the result as a JSON line")
+    p.set_defaults(func=cmd_startup)
+
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    try:
+        return args.func(args)
+    except BrokenPipeError:
+        return 0
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
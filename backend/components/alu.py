@@ -1,10 +1,30 @@
+# FLAG 寄存器的位定义
+FLAG_C = 0x01  # 进位 (Carry)
+FLAG_Z = 0x02  # 结果为零 (Zero)
+
+
 class ALU:
     """
     模拟算术逻辑单元 (Arithmetic Logic Unit)。
     它不存储任何状态，仅根据输入和控制信号执行计算。
+    标志位 (Z/C) 不在每次运算后立即计算：只记录最近一次运算及其操作数 (last_op)，
+    需要时再由 flags_for() 推导 (惰性求值)。
     """
     def __init__(self):
-        self.carry_out = 0
+        self.last_op = (0, 0, 0, 0, 0)
+
+    @staticmethod
+    def _raw(s_val: int, m_val: int, cn_val: int, in1: int, in2: int) -> int:
+        """未截断的运算结果 (可能超过 8 位)。"""
+        if m_val == 1:  # 算术运算
+            if s_val == 0b1001:  # ADC
+                return in1 + in2 + cn_val
+        else:  # 逻辑运算
+            if s_val == 0b0110:  # COM (NOT)
+                return ~in1 & 0xFF
+            elif s_val == 0b1011:  # AND
+                return in1 & in2
+        return 0
 
     def execute(self, s_val: int, m_val: int, cn_val: int, in1: int, in2: int) -> int:
         """
@@ -16,23 +36,22 @@ class ALU:
         :param in2: 第二个操作数
         :return: 8位计算结果
         """
-        self.carry_out = 0
-        raw_result = 0
-        
         in1 &= 0xFF
         in2 &= 0xFF
         cn_val &= 0x01
+        self.last_op = (s_val, m_val, cn_val, in1, in2)
+        return self._raw(s_val, m_val, cn_val, in1, in2) & 0xFF
 
-        if m_val == 1:  # 算术运算
-            if s_val == 0b1001:  # ADC
-                raw_result = in1 + in2 + cn_val
-        else:  # 逻辑运算
-            if s_val == 0b0110:  # COM (NOT)
-                raw_result = ~in1
-            elif s_val == 0b1011:  # AND
-                raw_result = in1 & in2
-        
-        if raw_result > 0xFF:
-            self.carry_out = 1
-            
-        return raw_result & 0xFF
\ No newline at end of file
+    @property
+    def carry_out(self) -> int:
+        """最近一次运算的进位输出 (按需计算)。"""
+        return 1 if self._raw(*self.last_op) > 0xFF else 0
+
+    @staticmethod
+    def flags_for(op: tuple) -> int:
+        """由一次运算 (last_op 格式) 推导出 FLAG 寄存器的值。"""
+        raw = ALU._raw(*op)
+        flags = FLAG_C if raw > 0xFF else 0
+        if raw & 0xFF == 0:
+            flags |= FLAG_Z
+        return flags
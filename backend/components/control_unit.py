@@ -1,3 +1,10 @@
+from .alu import FLAG_C, FLAG_Z
+
+# Bump whenever the observable behaviour of any instruction changes;
+# cached run results keyed on an older version are then never reused.
+ISA_VERSION = 1
+
+
 class ControlUnit:
     """
     The Control Unit (CU) is responsible for decoding instructions
@@ -6,54 +13,73 @@ class ControlUnit:
     def __init__(self):
         # Defines the instruction set architecture (ISA)
         # Key is the 4-bit opcode.
+        # 'cycles' is the number of micro-steps (T-states) the instruction takes,
+        # matching what the micro-step generator in cpu.py yields.
         self.OPCODES = {
-            0x0: {'name': 'NOP', 'args': 0},
-            0x1: {'name': 'LDA', 'args': 1}, # Load Accumulator from memory
-            0x2: {'name': 'STA', 'args': 1}, # Store Accumulator to memory
-            0x3: {'name': 'ADD', 'args': 1}, # Add memory to Accumulator
-            0x4: {'name': 'IN', 'args': 0},  # Input to Accumulator
-            0x5: {'name': 'OUT', 'args': 0}, # Output from Accumulator
-            0x6: {'name': 'JMP', 'args': 1}, # Unconditional Jump
-            0x7: {'name': 'JZ', 'args': 1},  # Jump if Zero flag is set
-            0x8: {'name': 'JC', 'args': 1},  # Jump if Carry flag is set
-            0xF: {'name': 'HALT', 'args': 0},# Halt the CPU
+            0x0: {'name': 'NOP', 'args': 0, 'cycles': 6},
+            0x1: {'name': 'LDA', 'args': 1, 'cycles': 8}, # Load Accumulator from memory
+            0x2: {'name': 'STA', 'args': 1, 'cycles': 8}, # Store Accumulator to memory
+            0x3: {'name': 'ADD', 'args': 1, 'cycles': 8}, # Add memory to Accumulator
+            0x4: {'name': 'IN', 'args': 0, 'cycles': 6},  # Input to Accumulator
+            0x5: {'name': 'OUT', 'args': 0, 'cycles': 6}, # Output from Accumulator
+            0x6: {'name': 'JMP', 'args': 1, 'cycles': 6}, # Unconditional Jump
+            0x7: {'name': 'JZ', 'args': 1, 'cycles': 6},  # Jump if Zero flag is set
+            0x8: {'name': 'JC', 'args': 1, 'cycles': 6},  # Jump if Carry flag is set
+            0xA: {'name': 'WAIT', 'args': 0, 'cycles': 6},# Sleep until the next device event
+            0xF: {'name': 'HALT', 'args': 0, 'cycles': 6},# Halt the CPU
         }
 
     def decode(self, instruction_code: int) -> dict:
         """
         Decodes a raw instruction byte into a dictionary.
-        This is the missing method that caused the crash.
+        Returns a copy of the ISA entry, so the operand never leaks into OPCODES.
         """
         if not isinstance(instruction_code, int):
-            return self.OPCODES[0x0] # Return NOP for invalid input
+            return dict(self.OPCODES[0x0], operand=0) # Return NOP for invalid input
 
         opcode_val = (instruction_code & 0xF0) >> 4
         operand = instruction_code & 0x0F
 
         # Find the instruction details from the ISA definition
         instruction_details = self.OPCODES.get(opcode_val, self.OPCODES[0x0]) # Default to NOP
-        instruction_details['operand'] = operand
-        return instruction_details
+        return dict(instruction_details, operand=operand)
 
     def execute(self, opcode: dict, rf, ram, alu, cpu_instance):
         """
-        Executes the logic for a decoded instruction.
-        This method's logic should be filled out to handle each instruction.
+        Executes a decoded instruction in one go (the non-visual path).
+        The micro-step generator in cpu.py performs the same operations split into T-states.
         """
         op_name = opcode.get('name')
         operand = opcode.get('operand')
 
-        # This is where the detailed logic for each instruction would go.
-        # For our current visualization, the core logic is handled by the
-        # micro-step generator in cpu.py. This method can be expanded later.
-        if op_name == 'HALT':
+        if op_name in ('LDA', 'ADD', 'STA'):
+            # Operand access goes through MAR/MDR, as in the micro-step path
+            rf.MAR.write(operand)
+            rf.MDR.write(rf.ACC.read() if op_name == 'STA' else ram.read(operand))
+
+        if op_name == 'LDA':
+            rf.ACC.write(rf.MDR.read())
+        elif op_name == 'STA':
+            ram.write(operand, rf.MDR.read())
+            cpu_instance.stores += 1
+        elif op_name == 'ADD':
+            rf.ACC.write(alu.execute(0b1001, 1, 0, rf.ACC.read(), rf.MDR.read()))
+            rf.FLAG.defer(alu.flags_for, alu.last_op)
+        elif op_name == 'IN':
+            rf.ACC.write(cpu_instance.input_device_val)
+        elif op_name == 'OUT':
+            cpu_instance.output.append(rf.ACC.read())
+        elif op_name == 'JMP':
+            rf.PC.write(operand)
+        elif op_name == 'JZ':
+            if rf.FLAG.read() & FLAG_Z:
+                rf.PC.write(operand)
+        elif op_name == 'JC':
+            if rf.FLAG.read() & FLAG_C:
+                rf.PC.write(operand)
+        elif op_name == 'WAIT':
+            cpu_instance.waiting = True
+        elif op_name == 'HALT':
             cpu_instance.halted = True
-        
-        # Example of how other instructions would be handled here in a non-visual run.
-        # elif op_name == 'LDA':
-        #     rf.ACC.write(ram.read(operand))
-        # elif op_name == 'ADD':
-        #     val = ram.read(operand)
-        #     alu.add(val)
-        
-        pass
\ No newline at end of file
+
+        cpu_instance.cycles += opcode['cycles']
@@ -1,26 +1,122 @@
+PAGE_SHIFT = 4
+PAGE_SIZE = 1 << PAGE_SHIFT
+PAGE_MASK = PAGE_SIZE - 1
+
+
 class RAM:
     """
     模拟随机存取存储器 (Random Access Memory)。
+    默认内存以私有 bytearray 存储，便于整块导入/导出 (存档、共享内存)。
+    share_image() 之后改为: 只读基础映像 (bytes, 可被多台机器共享) + 私有覆盖页
+    (只保存写过的页, 写时复制); 此时 read/write 换成覆盖页版本, 私有内存的机器不受影响。
     """
     def __init__(self, size=256):
         self.size = size
-        self.memory = [0] * size
+        self._data = bytearray(size)
+        self.base = None     # 共享模式下的只读映像
+        self.pages = {}      # 共享模式: 页号 -> bytearray(PAGE_SIZE)
 
     def write(self, address: int, value: int):
         """向指定内存地址写入一个字节。"""
         if 0 <= address < self.size:
-            self.memory[address] = int(value) & 0xFF
+            self._data[address] = int(value) & 0xFF
 
     def read(self, address: int) -> int:
         """从指定内存地址读取一个字节。"""
         if 0 <= address < self.size:
-            return self.memory[address]
+            return self._data[address]
         return 0
-    
-    def reset(self):
-        """将所有内存单元清零。"""
-        self.memory = [0] * self.size
+
+    def _write_shared(self, address: int, value: int):
+        if 0 <= address < self.size:
+            value = int(value) & 0xFF
+            index = address >> PAGE_SHIFT
+            page = self.pages.get(index)
+            if page is None:
+                if self.base[address] == value:
+                    return  # 与基础映像相同, 无需复制页
+                start = index << PAGE_SHIFT
+                page = self.pages[index] = bytearray(self.base[start:start + PAGE_SIZE])
+            page[address & PAGE_MASK] = value
+
+    def _read_shared(self, address: int) -> int:
+        if 0 <= address < self.size:
+            if self.pages:
+                page = self.pages.get(address >> PAGE_SHIFT)
+                if page is not None:
+                    return page[address & PAGE_MASK]
+            return self.base[address]
+        return 0
+
+    @property
+    def shared(self) -> bool:
+        return self.base is not None
+
+    def read_range(self, lo: int, hi: int) -> bytes:
+        """读取 [lo, hi) 范围内的字节; 共享模式下只合并与该范围重叠的覆盖页。"""
+        lo, hi = max(0, lo), min(hi, self.size)
+        if hi <= lo:
+            return b""
+        if self.base is None:
+            return bytes(self._data[lo:hi])
+        if not self.pages:
+            return self.base[lo:hi]
+        chunk = bytearray(self.base[lo:hi])
+        for index in range(lo >> PAGE_SHIFT, ((hi - 1) >> PAGE_SHIFT) + 1):
+            page = self.pages.get(index)
+            if page is not None:
+                start = index << PAGE_SHIFT
+                a, b = max(lo, start), min(hi, start + len(page))
+                chunk[a - lo:b - lo] = page[a - start:b - start]
+        return bytes(chunk)
+
+    @property
+    def memory(self):
+        """
+        当前内存内容。私有模式直接返回内部 bytearray; 共享模式返回基础映像
+        叠加覆盖页的临时副本 (不保存在 RAM 上, 内存占用只随写入的页增长)。
+        """
+        if self.base is None:
+            return self._data
+        return self.read_range(0, self.size)
+
+    @property
+    def private_bytes(self) -> int:
+        """本机私有的内存字节数 (共享模式下为覆盖页大小)。"""
+        if self.base is None:
+            return len(self._data)
+        return sum(len(page) for page in self.pages.values())
+
+    def share_image(self, image: bytes):
+        """
+        以 image 作为只读基础映像 (不复制, O(1))。多台机器可共用同一个 bytes 对象;
+        复位后内存回到该映像。
+        """
+        if not isinstance(image, bytes):
+            raise ValueError("shared images must be immutable bytes")
+        self.base = image
+        self.size = len(image)
+        self.pages = {}
+        self._data = None
+        self.read = self._read_shared
+        self.write = self._write_shared
+
+    def _make_private(self, data: bytearray):
+        self._data = data
+        self.size = len(data)
+        self.base = None
+        self.pages = {}
+        # 恢复类上的私有版本 read/write
+        self.__dict__.pop('read', None)
+        self.__dict__.pop('write', None)
+
+    def load_image(self, image):
+        """用一整块字节内容替换内存 (长度决定新的内存大小)。"""
+        self._make_private(bytearray(image))
 
     def reset(self):
-        """Resets all memory locations to 0."""
-        self.memory = [0] * self.size
\ No newline at end of file
+        """私有模式: 将所有内存单元清零; 共享模式: 丢弃覆盖页, 回到共享映像。"""
+        if self.base is None:
+            self._data = bytearray(self.size)
+        else:
+            self.pages = {}
@@ -14,6 +14,36 @@ class Register:
     def reset(self):
         self.value = 0
 
+class FlagRegister(Register):
+    """
+    FLAG register with lazy evaluation.
+    ALU operations only record themselves via defer(); the Z/C bits are computed
+    the first time the value is actually read (conditional jump, read_all, save state).
+    """
+    def __init__(self, name):
+        super().__init__(name)
+        self.evaluate = None
+        self.pending = None
+
+    def defer(self, evaluate, operands):
+        """Marks the value as `evaluate(operands)`, to be computed on the next read."""
+        self.evaluate = evaluate
+        self.pending = operands
+
+    def read(self):
+        if self.pending is not None:
+            super().write(self.evaluate(self.pending))
+            self.pending = None
+        return self.value
+
+    def write(self, value):
+        self.pending = None
+        super().write(value)
+
+    def reset(self):
+        self.pending = None
+        super().reset()
+
 class RegisterFile:
     def __init__(self):
         self.PC = Register("PC")
@@ -21,7 +51,7 @@ class RegisterFile:
         self.IR = Register("IR")
         self.MAR = Register("MAR")
         self.MDR = Register("MDR")
-        self.FLAG = Register("FLAG")
+        self.FLAG = FlagRegister("FLAG")
     
     def reset(self):
         for reg in self.__dict__.values():
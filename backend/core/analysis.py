@@ -0,0 +1,232 @@
+"""
+Static analysis of a RAM image.
+
+analyze(image) decodes the image with ControlUnit once and returns a
+ProgramAnalysis with:
+
+    blocks          basic blocks of reachable code and their JMP/JZ/JC/fall-through edges
+    code / data     addresses executed / read or written by reachable instructions
+    dead            non-zero bytes that are neither reachable code nor data
+    self_modifying  STA targets that are also reachable code
+    closed_loops    groups of blocks that, once entered, can never reach HALT or leave
+
+Conditional jumps are followed both ways and there are no indirect jumps, so
+the result over-approximates what can execute. It is exact as long as the
+program does not rewrite its own code (self_modifying is empty); engines can
+then rely on it, e.g. an image without any STA target can never change RAM.
+
+Each pass is linear in the image size, and results are cached by image hash.
+"""
+import hashlib
+from collections import OrderedDict
+
+from ..components.control_unit import ControlUnit
+
+PC_MASK = 0xFF  # PC is an 8-bit register
+CACHE_SIZE = 64
+
+_BRANCHES = ('JMP', 'JZ', 'JC')
+_MEMORY_READS = ('LDA', 'ADD')
+
+# Per-address flags in ProgramAnalysis.flags
+CODE = 0x01
+READ = 0x02
+WRITTEN = 0x04
+DEAD = 0x08
+
+_decode = ControlUnit().decode
+_cache = OrderedDict()
+
+
+class BasicBlock:
+    """Straight-line run of instructions [start, end]; only the last one can branch."""
+    def __init__(self, start):
+        self.start = start
+        self.end = start
+        self.successors = []
+        self.halts = False
+
+    def __repr__(self):
+        return f"BasicBlock(0x{self.start:02X}-0x{self.end:02X} -> {[hex(s) for s in self.successors]})"
+
+
+class ProgramAnalysis:
+    def __init__(self, image, entry, flags, blocks, closed_loops):
+        self.size = len(image)
+        self.entry = entry
+        self.flags = flags                  # bytearray, one CODE/READ/WRITTEN/DEAD mask per address
+        self.blocks = blocks                # start address -> BasicBlock
+        self.closed_loops = closed_loops    # list of sorted block start lists
+        self.code = frozenset(a for a, f in enumerate(flags) if f & CODE)
+        self.data = frozenset(a for a, f in enumerate(flags) if f & (READ | WRITTEN))
+        self.writes = frozenset(a for a, f in enumerate(flags) if f & WRITTEN)
+        self.dead = frozenset(a for a, f in enumerate(flags) if f & DEAD)
+        self.self_modifying = self.code & self.writes
+        self.halts = any(block.halts for block in blocks.values())
+
+    def regions(self) -> dict:
+        """address -> 'smc' / 'code' / 'data' / 'dead' for every classified byte (GUI colouring)."""
+        regions = {}
+        for address, flag in enumerate(self.flags):
+            if flag & CODE and flag & WRITTEN:
+                regions[address] = 'smc'
+            elif flag & CODE:
+                regions[address] = 'code'
+            elif flag & (READ | WRITTEN):
+                regions[address] = 'data'
+            elif flag & DEAD:
+                regions[address] = 'dead'
+        return regions
+
+    def summary(self) -> dict:
+        return {
+            "blocks": len(self.blocks),
+            "code_bytes": len(self.code),
+            "data_bytes": len(self.data),
+            "dead_bytes": len(self.dead),
+            "self_modifying": sorted(self.self_modifying),
+            "closed_loops": self.closed_loops,
+            "halts": self.halts,
+        }
+
+
+def _successors(address, instruction, size):
+    """Possible next PCs after executing `instruction` at `address`."""
+    name, operand = instruction['name'], instruction['operand']
+    following = (address + 1) & PC_MASK
+    if following >= size:
+        following = 0  # Past the end of RAM reads as NOP until PC wraps
+    if name == 'HALT':
+        return ()
+    if name == 'JMP':
+        return (operand,)
+    if name in ('JZ', 'JC'):
+        return (following, operand)
+    return (following,)
+
+
+def _closed_loops(blocks):
+    """Strongly connected components without an edge leaving them (iterative Tarjan)."""
+    index = {}
+    low = {}
+    on_stack = set()
+    stack = []
+    components = []
+    counter = 0
+    for root in blocks:
+        if root in index:
+            continue
+        work = [(root, iter(blocks[root].successors))]
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack.add(root)
+        while work:
+            node, children = work[-1]
+            for child in children:
+                if child not in index:
+                    index[child] = low[child] = counter
+                    counter += 1
+                    stack.append(child)
+                    on_stack.add(child)
+                    work.append((child, iter(blocks[child].successors)))
+                    break
+                if child in on_stack:
+                    low[node] = min(low[node], index[child])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node])
+                if low[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(component)
+
+    loops = []
+    for component in components:
+        members = set(component)
+        cyclic = len(component) > 1 or component[0] in blocks[component[0]].successors
+        if cyclic and all(s in members for m in component for s in blocks[m].successors):
+            loops.append(sorted(component))
+    return sorted(loops)
+
+
+def _analyze(image, entry):
+    size = len(image)
+    flags = bytearray(size)
+    decoded = {}
+
+    # Reachable instructions (worklist, each address visited once)
+    pending = [entry] if entry < size else []
+    while pending:
+        address = pending.pop()
+        if flags[address] & CODE:
+            continue
+        flags[address] |= CODE
+        instruction = decoded[address] = _decode(image[address])
+        name, operand = instruction['name'], instruction['operand']
+        if name in _MEMORY_READS and operand < size:
+            flags[operand] |= READ
+        elif name == 'STA' and operand < size:
+            flags[operand] |= WRITTEN
+        for successor in _successors(address, instruction, size):
+            if successor < size and not flags[successor] & CODE:
+                pending.append(successor)
+
+    for address in range(size):
+        if image[address] and not flags[address]:
+            flags[address] = DEAD
+
+    # Leaders: entry, branch targets, and whatever follows a branch
+    leaders = {entry} if entry < size else set()
+    for address, instruction in decoded.items():
+        if instruction['name'] in _BRANCHES:
+            leaders.update(s for s in _successors(address, instruction, size) if s in decoded)
+
+    blocks = {}
+    for start in sorted(leaders):
+        block = blocks[start] = BasicBlock(start)
+        address = start
+        while True:
+            instruction = decoded[address]
+            successors = _successors(address, instruction, size)
+            # Every non-leader has exactly one (sequential) predecessor, so each
+            # instruction is walked once
+            if instruction['name'] in _BRANCHES or not successors or successors[0] in leaders:
+                break
+            address = successors[0]
+        block.end = address
+        block.successors = [s for s in successors if s in decoded]
+        block.halts = instruction['name'] == 'HALT'
+
+    return ProgramAnalysis(image, entry, flags, blocks, _closed_loops(blocks))
+
+
+def image_hash(image, entry=0) -> bytes:
+    digest = hashlib.blake2b(bytes(image), digest_size=16)
+    digest.update(bytes((entry & PC_MASK,)))
+    return digest.digest()
+
+
+def analyze(image, entry=0) -> ProgramAnalysis:
+    """Analyzes a RAM image (bytes-like) for execution starting at `entry`; cached by image hash."""
+    image = bytes(image)
+    key = image_hash(image, entry)
+    analysis = _cache.get(key)
+    if analysis is not None:
+        _cache.move_to_end(key)
+        return analysis
+    analysis = _cache[key] = _analyze(image, entry)
+    while len(_cache) > CACHE_SIZE:
+        _cache.popitem(last=False)
+    return analysis
+
+
+def clear_cache():
+    _cache.clear()
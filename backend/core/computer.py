@@ -1,4 +1,5 @@
 from .cpu import CPU
+from . import savestate
 from ..components.ram import RAM
 
 class Computer:
@@ -21,14 +22,90 @@ class Computer:
         """
         if self.cpu.halted:
             return
+
+        self.cpu.poll_devices()
+        if self.cpu.waiting:
+            # WAIT 状态：时钟直接跳到下一个设备事件，不空转
+            self.cpu.skip_idle()
+            return
         
-        # 这是一个简化的执行逻辑，仅用于兼容旧版
-        # 实际的微指令执行在 run_micro_step_generator 中
-        pc_val = self.cpu.rf.PC.read()
+        # 与 run_micro_step_generator 的语义一致，只是不拆分微指令
+        rf = self.cpu.rf
+        pc_val = rf.PC.read()
         instruction = self.ram.read(pc_val)
-        self.cpu.rf.PC.write(pc_val + 1)
+        # 取指阶段的寄存器副作用与微指令路径相同: MAR <- PC, MDR/IR <- M(MAR)
+        rf.MAR.write(pc_val)
+        rf.MDR.write(instruction)
+        rf.IR.write(instruction)
+        rf.PC.write(pc_val + 1)
         opcode = self.cpu.control_unit.decode(instruction)
-        self.cpu.control_unit.execute(opcode, self.cpu.rf, self.ram, self.cpu.alu, self.cpu)
+        self.cpu.control_unit.execute(opcode, rf, self.ram, self.cpu.alu, self.cpu)
+
+    def run(self, max_instructions=None, max_cycles=None) -> dict:
+        """
+        连续执行宏指令，直到停机、预算用尽，或 CPU 再也无法被唤醒。
+        空闲时不空转：WAIT 直接跳到下一个事件；轮询循环 (两次回跳之间状态完全相同、
+        没有写内存、没有输出、没有事件发生) 一次跳过整数个循环周期，直到下一个事件之前。
+        返回统计信息字典。
+        """
+        cpu, rf = self.cpu, self.cpu.rf
+        instructions = 0
+        skipped_cycles = 0
+        reason = "halted"
+        loop_mark = None  # (状态指纹, 当时的 cycles, 当时的 instructions)
+
+        while not cpu.halted:
+            if max_instructions is not None and instructions >= max_instructions:
+                reason = "instruction_budget"
+                break
+            if max_cycles is not None and cpu.cycles >= max_cycles:
+                reason = "cycle_budget"
+                break
+
+            if cpu.waiting:
+                before = cpu.cycles
+                cpu.poll_devices()
+                if cpu.waiting:
+                    if not cpu.skip_idle():
+                        reason = "deadlock"  # WAIT 且没有任何待触发事件
+                        break
+                    skipped_cycles += cpu.cycles - before
+                continue
+
+            pc_val = rf.PC.read()
+            self.run_single_macro_step()
+            instructions += 1
+
+            if rf.PC.read() > pc_val or cpu.halted or cpu.waiting:
+                continue
+            # 回跳：与上一次回跳时的完整状态比较
+            mark = (rf.PC.read(), rf.ACC.read(), rf.FLAG.read(), cpu.input_device_val,
+                    cpu.stores, cpu.events_fired, len(cpu.output))
+            if loop_mark is not None and loop_mark[0] == mark:
+                period = cpu.cycles - loop_mark[1]
+                next_time = cpu.scheduler.next_time()
+                if next_time is None:
+                    reason = "idle_loop"  # 死循环且没有事件能改变它
+                    break
+                loops = (next_time - cpu.cycles) // period
+                if max_cycles is not None:
+                    loops = min(loops, max(0, (max_cycles - cpu.cycles) // period))
+                if max_instructions is not None:
+                    per_loop = instructions - loop_mark[2]
+                    loops = min(loops, (max_instructions - instructions) // per_loop)
+                if loops > 0:
+                    cpu.cycles += loops * period
+                    skipped_cycles += loops * period
+                    instructions += loops * (instructions - loop_mark[2])
+            loop_mark = (mark, cpu.cycles, instructions)
+
+        return {
+            "instructions": instructions,
+            "cycles": cpu.cycles,
+            "skipped_cycles": skipped_cycles,
+            "halted": cpu.halted,
+            "reason": reason,
+        }
 
     def get_micro_step_generator(self):
         """
@@ -37,6 +114,37 @@ class Computer:
         """
         return self.cpu.run_micro_step_generator()
 
+    def save_state(self, path):
+        """将寄存器、停机标志、设备状态和整块内存写入存档文件 (见 savestate.py)。"""
+        savestate.save(self, path)
+
+    def load_state(self, path):
+        """从存档文件恢复状态。文件以 mmap 方式读取，内存镜像整块拷贝。"""
+        savestate.load(path, self)
+
+    def to_bytes(self) -> bytes:
+        """与存档文件相同格式的字节串，可直接发送给工作进程。"""
+        return savestate.dumps(self)
+
+    @classmethod
+    def from_bytes(cls, data):
+        """由 to_bytes() 的结果创建一台新计算机。"""
+        return savestate.loads(data)
+
+    @classmethod
+    def from_image(cls, image: bytes):
+        """
+        创建一台以 image 为共享只读内存映像的计算机 (O(1), 不复制映像)。
+        大量机器运行同一程序时先装载一次, 再共享:
+            proto = Computer(); proto.load_program(program)
+            image = bytes(proto.ram.memory)
+            machines = [Computer.from_image(image) for _ in range(10000)]
+        每台机器只为自己写过的页分配内存; reset() 回到 image。
+        """
+        computer = cls(0)  # 不分配私有内存, 大小由 image 决定
+        computer.ram.share_image(image)
+        return computer
+
     def reset(self):
         self.cpu.reset()
-        self.ram.reset()
\ No newline at end of file
+        self.ram.reset()
@@ -1,6 +1,7 @@
-from ..components.alu import ALU
+from ..components.alu import ALU, FLAG_C, FLAG_Z
 from ..components.control_unit import ControlUnit
 from ..components.register import RegisterFile
+from .scheduler import EventScheduler, INPUT
 
 class CPU:
     def __init__(self, ram):
@@ -9,16 +10,55 @@ class CPU:
         # --- FIX ---
         # The ALU constructor does not take any arguments.
         # It operates on data passed to its 'execute' method.
-        self.alu = ALU() 
+        self.alu = ALU()
         # -----------
         self.control_unit = ControlUnit()
         self.halted = False
         self.input_device_val = 0
 
+        # --- Time and devices ---
+        self.cycles = 0            # One cycle per micro-step (T-state)
+        self.waiting = False       # Sleeping in WAIT until the next device event
+        self.output = []           # Values written by OUT
+        self.stores = 0            # Number of STA writes, lets idle-loop detection spot RAM changes
+        self.events_fired = 0
+        self.scheduler = EventScheduler()
+
     def reset(self):
         self.rf.reset()
         self.halted = False
         self.input_device_val = 0
+        self.cycles = 0
+        self.waiting = False
+        self.output = []
+        self.stores = 0
+        self.events_fired = 0
+        self.scheduler.clear()
+
+    def poll_devices(self):
+        """Fires every scheduled event that is due at the current cycle."""
+        next_time = self.scheduler.next_time()
+        if next_time is None or next_time > self.cycles:
+            return
+        for time, _, kind, value, _ in self.scheduler.pop_due(self.cycles):
+            if kind == INPUT:
+                self.input_device_val = value
+            # Any device event (input arrival or timer) wakes a WAITing CPU
+            self.waiting = False
+            self.events_fired += 1
+
+    def skip_idle(self) -> bool:
+        """
+        While WAITing, jumps the clock straight to the next scheduled event instead
+        of spinning empty cycles. Returns False if there is nothing left to wake the CPU.
+        """
+        next_time = self.scheduler.next_time()
+        if next_time is None:
+            return False
+        if next_time > self.cycles:
+            self.cycles = next_time
+        self.poll_devices()
+        return True
 
     def _get_current_state(self, active_components=None, active_buses=None):
         """
@@ -28,10 +68,17 @@ class CPU:
         return {
             "registers": self.rf.read_all(),
             "halted": self.halted,
+            "waiting": self.waiting,
+            "cycles": self.cycles,
             "active_components": active_components or set(),
             "active_buses": active_buses or set(),
         }
 
+    def _tick(self, active_components=None, active_buses=None):
+        """Advances the clock by one T-state and packages the resulting state."""
+        self.cycles += 1
+        return self._get_current_state(active_components, active_buses)
+
     def run_micro_step_generator(self):
         """
         This is a generator that executes each micro-operation of a single macro-instruction step-by-step.
@@ -41,11 +88,18 @@ class CPU:
             yield self._get_current_state(active_components={'CPU_HALTED'})
             return
 
+        self.poll_devices()
+        if self.waiting:
+            # Idle: fast-forward to the next device event (if any) and show the wake-up
+            self.skip_idle()
+            yield self._get_current_state(active_components={'CPU_WAITING'} if self.waiting else {'CU'})
+            return
+
         # --- 1. Fetch Cycle ---
         # T0: PC -> MAR
         pc_val = self.rf.PC.read()
         self.rf.MAR.write(pc_val)
-        yield self._get_current_state(
+        yield self._tick(
             active_components={'PC', 'MAR'},
             active_buses={'PC_MAR_BUS', 'ADDR_BUS'}
         )
@@ -53,51 +107,105 @@ class CPU:
         # T1: M(MAR) -> MDR
         instruction_code = self.ram.read(self.rf.MAR.read())
         self.rf.MDR.write(instruction_code)
-        yield self._get_current_state(
+        yield self._tick(
             active_components={'RAM', 'MDR'},
             active_buses={'DATA_BUS'}
         )
 
         # T2: MDR -> IR
         self.rf.IR.write(self.rf.MDR.read())
-        yield self._get_current_state(
+        yield self._tick(
             active_components={'MDR', 'IR'},
             active_buses={'MDR_IR_BUS'}
         )
 
         # T3: PC++
         self.rf.PC.write(pc_val + 1)
-        yield self._get_current_state(
+        yield self._tick(
             active_components={'PC', 'ALU'},
             active_buses={'PC_ALU_BUS'}
         )
 
         # --- 2. Decode & Execute Cycle ---
         opcode = self.control_unit.decode(self.rf.IR.read())
-        
-        yield self._get_current_state(active_components={'CU', 'IR'})
+        operand = opcode['operand']
+
+        yield self._tick(active_components={'CU', 'IR'})
 
         # --- Execute micro-code for different instructions ---
-        if opcode['name'] == 'LDA':
-            # Simplified micro-code for LDA
-            self.rf.ACC.write(self.rf.MDR.read())
-            yield self._get_current_state(
-                active_components={'MDR', 'ACC', 'CU'},
-                active_buses={'MDR_ACC_BUS'}
+        if opcode['name'] in ('LDA', 'ADD', 'STA'):
+            # IR(address) -> MAR
+            self.rf.MAR.write(operand)
+            yield self._tick(
+                active_components={'IR', 'MAR', 'CU'},
+                active_buses={'ADDR_BUS'}
             )
-        
-        elif opcode['name'] == 'ADD':
-            # Simplified micro-code for ADD
-            yield self._get_current_state(active_components={'ALU', 'ACC', 'MDR', 'CU'})
-        
-        elif opcode['name'] == 'STA':
-            # Simplified micro-code for STA
-            yield self._get_current_state(active_components={'ACC', 'MDR', 'MAR', 'RAM', 'CU'}, active_buses={'ADDR_BUS', 'DATA_BUS'})
+
+            if opcode['name'] == 'STA':
+                # ACC -> MDR
+                self.rf.MDR.write(self.rf.ACC.read())
+                yield self._tick(
+                    active_components={'ACC', 'MDR', 'CU'},
+                    active_buses={'MDR_ACC_BUS'}
+                )
+                # MDR -> M(MAR)
+                self.ram.write(self.rf.MAR.read(), self.rf.MDR.read())
+                self.stores += 1
+                yield self._tick(
+                    active_components={'MDR', 'MAR', 'RAM', 'CU'},
+                    active_buses={'ADDR_BUS', 'DATA_BUS'}
+                )
+            else:
+                # M(MAR) -> MDR
+                self.rf.MDR.write(self.ram.read(self.rf.MAR.read()))
+                yield self._tick(
+                    active_components={'RAM', 'MDR', 'CU'},
+                    active_buses={'DATA_BUS'}
+                )
+                if opcode['name'] == 'LDA':
+                    # MDR -> ACC
+                    self.rf.ACC.write(self.rf.MDR.read())
+                    yield self._tick(
+                        active_components={'MDR', 'ACC', 'CU'},
+                        active_buses={'MDR_ACC_BUS'}
+                    )
+                else:
+                    # ACC + MDR -> ACC, ALU -> FLAG (evaluated lazily)
+                    self.rf.ACC.write(self.alu.execute(0b1001, 1, 0, self.rf.ACC.read(), self.rf.MDR.read()))
+                    self.rf.FLAG.defer(self.alu.flags_for, self.alu.last_op)
+                    yield self._tick(
+                        active_components={'ALU', 'ACC', 'MDR', 'FLAG', 'CU'},
+                        active_buses={'MDR_ACC_BUS'}
+                    )
+
+        elif opcode['name'] == 'IN':
+            self.rf.ACC.write(self.input_device_val)
+            yield self._tick(active_components={'ACC', 'CU'})
+
+        elif opcode['name'] == 'OUT':
+            self.output.append(self.rf.ACC.read())
+            yield self._tick(active_components={'ACC', 'CU'})
+
+        elif opcode['name'] == 'JMP':
+            self.rf.PC.write(operand)
+            yield self._tick(active_components={'IR', 'PC', 'CU'})
+
+        elif opcode['name'] in ('JZ', 'JC'):
+            mask = FLAG_Z if opcode['name'] == 'JZ' else FLAG_C
+            if self.rf.FLAG.read() & mask:
+                self.rf.PC.write(operand)
+                yield self._tick(active_components={'FLAG', 'IR', 'PC', 'CU'})
+            else:
+                yield self._tick(active_components={'FLAG', 'CU'})
+
+        elif opcode['name'] == 'WAIT':
+            self.waiting = True
+            yield self._tick(active_components={'CU', 'CPU_WAITING'})
 
         elif opcode['name'] == 'HALT':
             self.halted = True
-            yield self._get_current_state(active_components={'CU', 'CPU_HALTED'})
-        
+            yield self._tick(active_components={'CU', 'CPU_HALTED'})
+
         else:
             # For other instructions, just highlight the CU
-            yield self._get_current_state(active_components={'CU'})
\ No newline at end of file
+            yield self._tick(active_components={'CU'})
@@ -0,0 +1,296 @@
+"""
+Networks of Computers wired OUT -> IN through bounded channels.
+
+Execution is quantum-synchronous: in every round each machine runs up to
+`quantum` instructions, then all channels are exchanged at a barrier. During
+a quantum a machine only sees values delivered at the previous barrier, and
+may only send as many values as its channel had free slots (credits) at that
+barrier; IN on an empty inbox or OUT without credits blocks the machine for
+the rest of the quantum. quantum=1 is lockstep.
+
+Because nothing crosses machines except at barriers, the result does not
+depend on how machines are spread over processes: workers=0 runs everything
+in-process, workers=N spreads the machines over N persistent worker processes
+and ships the channel traffic between quanta in one batch per worker.
+Machine states travel as save-state bytes (Computer.to_bytes), not pickles.
+"""
+import hashlib
+import multiprocessing as mp
+import time
+from collections import deque
+
+from . import savestate
+from .computer import Computer
+from .scheduler import INPUT
+
+_OP_IN = 0x4
+_OP_OUT = 0x5
+
+DEFAULT_CAPACITY = 16
+DEFAULT_QUANTUM = 256
+
+
+class _Node:
+    """A machine plus its port state; lives wherever the machine is executed."""
+    def __init__(self, name, computer, has_in, has_out, credits):
+        self.name = name
+        self.computer = computer
+        self.has_in = has_in
+        self.has_out = has_out
+        self.inbox = deque()
+        self.outbox = []
+        self.credits = credits
+        self.instructions = 0
+        self.blocked = 0        # Quanta cut short by an empty inbox / full channel
+        self.busy_time = 0.0
+
+    def run_quantum(self, quantum):
+        computer = self.computer
+        cpu, ram, pc_reg = computer.cpu, computer.ram, computer.cpu.rf.PC
+        start = time.perf_counter()
+        executed = 0
+        while executed < quantum and not cpu.halted:
+            if cpu.waiting:
+                computer.run_single_macro_step()
+                if cpu.waiting:
+                    break  # Nothing scheduled will ever wake it
+                continue
+            op = ram.read(pc_reg.read()) >> 4
+            if op == _OP_IN and self.has_in:
+                if not self.inbox:
+                    self.blocked += 1
+                    break
+                cpu.input_device_val = self.inbox.popleft()
+            elif op == _OP_OUT and self.has_out and self.credits == 0:
+                self.blocked += 1
+                break
+            computer.run_single_macro_step()
+            executed += 1
+            if op == _OP_OUT and self.has_out:
+                self.outbox.append(cpu.output.pop())
+                self.credits -= 1
+        self.instructions += executed
+        self.busy_time += time.perf_counter() - start
+        return executed
+
+    def stats(self):
+        return {
+            "instructions": self.instructions,
+            "blocked_quanta": self.blocked,
+            "halted": self.computer.cpu.halted,
+            "busy_time": self.busy_time,
+            "instr_per_sec": self.instructions / self.busy_time if self.busy_time else 0.0,
+        }
+
+
+def _ports(network, name):
+    """(has_in, has_out, initial credits) of a machine in the network."""
+    has_in = any(dst == name for dst, _ in network.channels.values())
+    has_out = name in network.channels
+    credits = network.channels[name][1] if has_out else 0
+    return has_in, has_out, credits
+
+
+def _run_round(nodes, quantum, deliveries):
+    """
+    Applies one barrier's deliveries/credits and runs every node for a quantum.
+    Shared by both backends so that they cannot diverge.
+    """
+    for name, (values, credits) in deliveries.items():
+        node = nodes[name]
+        node.inbox.extend(values)
+        if credits is not None:
+            node.credits = credits
+    report = {}
+    for name, node in nodes.items():
+        executed = node.run_quantum(quantum)
+        report[name] = (node.outbox, len(node.inbox), executed, node.computer.cpu.halted)
+        node.outbox = []
+    return report
+
+
+def _worker_main(conn):
+    """
+    Persistent worker: receives its nodes once, then one message per round with
+    deliveries/credits and answers with outboxes and inbox lengths.
+    """
+    nodes = {}
+    while True:
+        command, payload = conn.recv()
+        if command == 'init':
+            for name, state, has_in, has_out, credits in payload:
+                nodes[name] = _Node(name, Computer.from_bytes(state), has_in, has_out, credits)
+            conn.send(None)
+        elif command == 'round':
+            quantum, deliveries = payload
+            conn.send(_run_round(nodes, quantum, deliveries))
+        elif command == 'finish':
+            conn.send({name: (node.computer.to_bytes(), node.stats()) for name, node in nodes.items()})
+            break
+    conn.close()
+
+
+class Network:
+    """
+    net = Network()
+    net.add_machine("producer", a); net.add_machine("consumer", b)
+    net.connect("producer", "consumer", capacity=8)
+    stats = net.run(quantum=256, workers=2)
+    """
+    def __init__(self):
+        self.machines = {}
+        self.channels = {}  # source name -> (destination name, capacity)
+
+    def add_machine(self, name, computer):
+        self.machines[name] = computer
+
+    def connect(self, source, destination, capacity=DEFAULT_CAPACITY):
+        """Wires source's OUT to destination's IN (each machine has one port of each kind)."""
+        if source not in self.machines or destination not in self.machines:
+            raise KeyError(f"unknown machine in channel {source} -> {destination}")
+        if source in self.channels:
+            raise ValueError(f"{source} already has an output channel")
+        if any(dst == destination for dst, _ in self.channels.values()):
+            raise ValueError(f"{destination} already has an input channel")
+        if capacity < 1:
+            raise ValueError("channel capacity must be at least 1")
+        self.channels[source] = (destination, capacity)
+
+    def run(self, quantum=DEFAULT_QUANTUM, max_rounds=10000, workers=0, record=False) -> dict:
+        """
+        Runs until every machine halts, the network deadlocks (a round with no
+        progress and nothing in flight) or max_rounds is reached. Machines fed by a
+        channel may have timer events but no scheduled INPUT events.
+        The Computers added to the network hold the final states afterwards.
+        """
+        receivers = {dst: src for src, (dst, _) in self.channels.items()}
+        for dst in receivers:
+            # A scheduled INPUT would be polled in the same step and overwrite the channel value
+            if any(event[2] == INPUT for event in self.machines[dst].cpu.scheduler.events()):
+                raise ValueError(f"{dst} reads from a channel and cannot also have scheduled INPUT events")
+        # Per channel (keyed by source): values to deliver at the next barrier, consumer inbox length
+        in_flight = {src: [] for src in self.channels}
+        inbox_len = {dst: 0 for dst in receivers}
+        log = [] if record else None
+        digest = hashlib.blake2b(digest_size=16)
+
+        if workers:
+            backend = _ProcessBackend(self, workers)
+        else:
+            backend = _LocalBackend(self)
+
+        start = time.perf_counter()
+        rounds = 0
+        reason = "max_rounds"
+        try:
+            while rounds < max_rounds:
+                # Barrier: deliver last round's traffic and hand out credits
+                deliveries = {}
+                for src, (dst, capacity) in self.channels.items():
+                    values = in_flight[src]
+                    in_flight[src] = []
+                    inbox_len[dst] += len(values)
+                    deliveries.setdefault(dst, [[], None])[0].extend(values)
+                    deliveries.setdefault(src, [[], None])[1] = capacity - inbox_len[dst]
+                    if values:
+                        digest.update(f"{rounds}:{src}:".encode() + bytes(values))
+                        if record:
+                            log.append((rounds, src, dst, list(values)))
+
+                report = backend.round(quantum, deliveries)
+                rounds += 1
+
+                progress = False
+                for name, (outbox, pending, executed, halted) in report.items():
+                    if name in self.channels:
+                        in_flight[name].extend(outbox)
+                    if name in inbox_len:
+                        inbox_len[name] = pending
+                    progress = progress or executed > 0
+
+                if all(halted for _, _, _, halted in report.values()):
+                    reason = "halted"
+                    break
+                if not progress and not any(in_flight.values()):
+                    reason = "deadlock"
+                    break
+        finally:
+            node_stats = backend.finish()
+        elapsed = time.perf_counter() - start
+
+        for name, computer in self.machines.items():
+            digest.update(name.encode() + computer.to_bytes())
+        total = sum(s["instructions"] for s in node_stats.values())
+        return {
+            "rounds": rounds,
+            "reason": reason,
+            "elapsed": elapsed,
+            "instructions": total,
+            "instr_per_sec": total / elapsed if elapsed else 0.0,
+            "machines": node_stats,
+            # Identical for identical inputs, whatever quantum-to-process mapping ran it
+            "checksum": digest.hexdigest(),
+            "log": log,
+        }
+
+
+class _LocalBackend:
+    """Runs every node in this process."""
+    def __init__(self, network):
+        self.nodes = {name: _Node(name, computer, *_ports(network, name))
+                      for name, computer in network.machines.items()}
+
+    def round(self, quantum, deliveries):
+        return _run_round(self.nodes, quantum, deliveries)
+
+    def finish(self):
+        return {name: node.stats() for name, node in self.nodes.items()}
+
+
+class _ProcessBackend:
+    """Spreads the nodes round-robin over persistent worker processes."""
+    def __init__(self, network, workers):
+        self.network = network
+        names = sorted(network.machines)
+        groups = [names[i::workers] for i in range(workers)]
+        self.groups = [group for group in groups if group]
+        self.owner = {}
+        self.conns = []
+        self.processes = []
+        for index, group in enumerate(self.groups):
+            parent_conn, child_conn = mp.Pipe()
+            process = mp.Process(target=_worker_main, args=(child_conn,), daemon=True)
+            process.start()
+            child_conn.close()
+            payload = []
+            for name in group:
+                self.owner[name] = index
+                payload.append((name, network.machines[name].to_bytes(), *_ports(network, name)))
+            parent_conn.send(('init', payload))
+            self.conns.append(parent_conn)
+            self.processes.append(process)
+        for conn in self.conns:
+            conn.recv()
+
+    def round(self, quantum, deliveries):
+        batches = [{} for _ in self.conns]
+        for name, delivery in deliveries.items():
+            batches[self.owner[name]][name] = delivery
+        for conn, batch in zip(self.conns, batches):
+            conn.send(('round', (quantum, batch)))
+        report = {}
+        for conn in self.conns:
+            report.update(conn.recv())
+        return report
+
+    def finish(self):
+        node_stats = {}
+        for conn in self.conns:
+            conn.send(('finish', None))
+        for conn in self.conns:
+            for name, (state, stats) in conn.recv().items():
+                savestate.loads(state, self.network.machines[name])
+                node_stats[name] = stats
+        for process in self.processes:
+            process.join(timeout=2)
+        return node_stats
@@ -0,0 +1,171 @@
+"""
+Content-addressed cache for whole-program runs (Computer.run).
+
+The key is a hash of the complete starting machine (save-state bytes: RAM
+image, registers, input device value, scheduled events), the run budgets and
+the ISA/engine/save-state versions. A hit restores the stored final state into
+the Computer and returns the stored run statistics without simulating.
+
+Two tiers:
+    memory  an LRU of the most recent results (OrderedDict)
+    disk    one file per key in `disk_dir`, evicted oldest-first once the
+            directory exceeds `max_disk_bytes`
+"""
+import hashlib
+import json
+import os
+import struct
+from collections import OrderedDict
+
+from . import savestate
+from ..components.control_unit import ISA_VERSION
+
+# Bump when Computer.run changes in a way that affects results or statistics
+ENGINE_VERSION = 1
+
+_LENGTH = struct.Struct("<I")
+
+
+class ResultCache:
+    def __init__(self, max_entries=1024, disk_dir=None, max_disk_bytes=64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.disk_dir = disk_dir
+        self.max_disk_bytes = max_disk_bytes
+        self._memory = OrderedDict()  # key -> (stats, final state bytes)
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        self._disk_bytes = 0
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+            self._disk_bytes = sum(size for _, _, size in self._disk_entries())
+
+    def key(self, computer, max_instructions=None, max_cycles=None) -> str:
+        """Content hash of everything that determines the result of a run."""
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(f"isa={ISA_VERSION};engine={ENGINE_VERSION};state={savestate.VERSION};"
+                      f"instr={max_instructions};cycles={max_cycles};".encode())
+        digest.update(savestate.dumps(computer))
+        return digest.hexdigest()
+
+    def run(self, computer, max_instructions=None, max_cycles=None) -> dict:
+        """
+        Drop-in replacement for computer.run(). On a hit the final state is loaded
+        into `computer` and the cached statistics are returned.
+        """
+        key = self.key(computer, max_instructions, max_cycles)
+        entry = self._memory.get(key)
+        if entry is not None:
+            self._memory.move_to_end(key)
+            self.hits += 1
+        else:
+            entry = self._read_disk(key)
+            if entry is not None:
+                self.hits += 1
+                self.disk_hits += 1
+                self._remember(key, entry)
+
+        if entry is not None:
+            stats, state = entry
+            savestate.loads(state, computer)
+            return dict(stats)
+
+        self.misses += 1
+        stats = computer.run(max_instructions, max_cycles)
+        entry = (dict(stats), savestate.dumps(computer))
+        self._remember(key, entry)
+        self._write_disk(key, entry)
+        return stats
+
+    def metrics(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "memory_entries": len(self._memory),
+            "disk_bytes": self._disk_bytes,
+        }
+
+    def clear(self):
+        """Empties both tiers (metrics are kept)."""
+        self._memory.clear()
+        for path, _, _ in self._disk_entries():
+            os.remove(path)
+        self._disk_bytes = 0
+
+    # --- memory tier ---
+
+    def _remember(self, key, entry):
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    # --- disk tier ---
+
+    def _path(self, key):
+        return os.path.join(self.disk_dir, key + ".run")
+
+    def _disk_entries(self):
+        """(path, mtime, size) of every cached file."""
+        entries = []
+        for entry in os.scandir(self.disk_dir):
+            if entry.name.endswith(".run"):
+                st = entry.stat()
+                entries.append((entry.path, st.st_mtime, st.st_size))
+        return entries
+
+    def _read_disk(self, key):
+        if not self.disk_dir:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        try:
+            (length,) = _LENGTH.unpack_from(data)
+            stats = json.loads(data[_LENGTH.size:_LENGTH.size + length])
+            state = data[_LENGTH.size + length:]
+            savestate.loads(state)  # Validate before touching the caller's machine
+        except (struct.error, ValueError, UnicodeDecodeError):
+            # Truncated or corrupt entry: drop it and recompute
+            self._disk_bytes = max(0, self._disk_bytes - len(data))
+            os.remove(path)
+            return None
+        os.utime(path)  # Mark as recently used for eviction
+        return stats, state
+
+    def _write_disk(self, key, entry):
+        if not self.disk_dir:
+            return
+        stats, state = entry
+        encoded = json.dumps(stats).encode()
+        data = _LENGTH.pack(len(encoded)) + encoded + state
+        if len(data) > self.max_disk_bytes:
+            return
+
+        path = self._path(key)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        self._disk_bytes += len(data)
+        if self._disk_bytes > self.max_disk_bytes:
+            self._evict_disk()
+
+    def _evict_disk(self):
+        """Deletes least recently used files until the tier fits in max_disk_bytes."""
+        entries = sorted(self._disk_entries(), key=lambda e: e[1])
+        total = sum(size for _, _, size in entries)
+        for path, _, size in entries:
+            if total <= self.max_disk_bytes:
+                break
+            os.remove(path)
+            total -= size
+        self._disk_bytes = total
@@ -0,0 +1,127 @@
+"""
+Binary save-state format for a Computer.
+
+Layout (little endian):
+
+    header   magic b'CASS', u16 version, u16 header size
+    machine  one byte per register (REGISTER_ORDER), halted flag, waiting flag,
+             input device value, u64 cycle counter, u32 STA count,
+             u32 event count, u32 output count, u32 RAM size, u32 RAM offset
+    events   pending scheduler events: u64 time, u8 kind, u8 value, u64 period
+    output   one byte per value written by OUT
+    padding  up to RAM_ALIGN
+    ram      raw RAM image, `RAM size` bytes
+
+The RAM image is stored raw and aligned so that a loader can memory-map the
+file and hand the slice straight to RAM without parsing it. The same bytes
+are used to ship machine states to worker processes (`dumps`/`loads`).
+"""
+import mmap
+import os
+import struct
+
+MAGIC = b"CASS"
+VERSION = 1
+RAM_ALIGN = 64
+
+REGISTER_ORDER = ("PC", "ACC", "IR", "MAR", "MDR", "FLAG")
+
+_HEADER = struct.Struct("<4sHH")
+_MACHINE = struct.Struct("<6B??BQIIIII")
+_EVENT = struct.Struct("<QBBQ")
+
+
+def _align(offset: int) -> int:
+    return (offset + RAM_ALIGN - 1) // RAM_ALIGN * RAM_ALIGN
+
+
+def dumps(computer) -> bytes:
+    """Serializes the complete machine state into the save-state format."""
+    cpu, ram = computer.cpu, computer.ram
+    events = cpu.scheduler.events()
+    output = bytes(value & 0xFF for value in cpu.output)
+
+    body = [_EVENT.pack(time, kind, value, period) for time, _, kind, value, period in events]
+    body.append(output)
+    body_size = sum(len(part) for part in body)
+    offset = _align(_HEADER.size + _MACHINE.size + body_size)
+
+    header = _HEADER.pack(MAGIC, VERSION, _HEADER.size)
+    machine = _MACHINE.pack(
+        *(getattr(cpu.rf, name).read() for name in REGISTER_ORDER),
+        cpu.halted,
+        cpu.waiting,
+        cpu.input_device_val & 0xFF,
+        cpu.cycles,
+        cpu.stores & 0xFFFFFFFF,
+        len(events),
+        len(output),
+        ram.size,
+        offset,
+    )
+    padding = bytes(offset - _HEADER.size - _MACHINE.size - body_size)
+    return b"".join((header, machine, *body, padding, ram.memory))
+
+
+def loads(data, computer=None):
+    """
+    Restores a machine from save-state bytes (bytes, bytearray, memoryview or mmap).
+    Restores into `computer` if given, otherwise into a new Computer.
+    """
+    with memoryview(data) as view:
+        if len(view) < _HEADER.size:
+            raise ValueError("save state is truncated")
+        magic, version, _ = _HEADER.unpack_from(view)
+        if magic != MAGIC:
+            raise ValueError("not a projectCAS save state")
+        if version != VERSION:
+            raise ValueError(f"unsupported save state version {version} (expected {VERSION})")
+
+        if len(view) < _HEADER.size + _MACHINE.size:
+            raise ValueError("save state is truncated")
+        (*registers, halted, waiting, input_val, cycles, stores,
+         n_events, n_output, ram_size, ram_offset) = _MACHINE.unpack_from(view, _HEADER.size)
+        if ram_offset + ram_size > len(view):
+            raise ValueError("save state RAM image is truncated")
+
+        if computer is None:
+            from .computer import Computer
+            computer = Computer(ram_size)
+
+        cpu = computer.cpu
+        cpu.reset()
+        for name, value in zip(REGISTER_ORDER, registers):
+            getattr(cpu.rf, name).write(value)
+        cpu.halted = halted
+        cpu.waiting = waiting
+        cpu.input_device_val = input_val
+        cpu.cycles = cycles
+        cpu.stores = stores
+
+        pos = _HEADER.size + _MACHINE.size
+        for _ in range(n_events):
+            time, kind, value, period = _EVENT.unpack_from(view, pos)
+            cpu.scheduler.schedule(time, kind, value, period)
+            pos += _EVENT.size
+        cpu.output = list(view[pos:pos + n_output])
+
+        # A single copy straight out of the buffer; no per-byte decoding
+        computer.ram.load_image(view[ram_offset:ram_offset + ram_size])
+    return computer
+
+
+def save(computer, path):
+    """Writes the state atomically (temporary file + rename)."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(dumps(computer))
+    os.replace(tmp_path, path)
+
+
+def load(path, computer=None):
+    """Memory-maps the file and restores the machine from it."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            raise ValueError(f"{path}: empty save state")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return loads(mapped, computer)
@@ -0,0 +1,54 @@
+import heapq
+
+# Event kinds
+INPUT = 0   # A new value arrives at the input device
+TIMER = 1   # A timer fires (optionally periodic)
+
+
+class EventScheduler:
+    """
+    Priority queue of device events ordered by the CPU cycle at which they fire.
+    Events are plain tuples (time, seq, kind, value, period); `seq` keeps the
+    order of events scheduled for the same cycle stable.
+    """
+    def __init__(self):
+        self._queue = []
+        self._seq = 0
+
+    def schedule(self, time: int, kind: int, value: int = 0, period: int = 0):
+        heapq.heappush(self._queue, (time, self._seq, kind, value, period))
+        self._seq += 1
+
+    def schedule_input(self, time: int, value: int):
+        """The input device will read `value` from cycle `time` on."""
+        self.schedule(time, INPUT, value & 0xFF)
+
+    def schedule_timer(self, time: int, period: int = 0):
+        """A timer interrupt at cycle `time`, repeating every `period` cycles if period > 0."""
+        self.schedule(time, TIMER, 0, period)
+
+    def next_time(self):
+        """Cycle of the earliest pending event, or None if the queue is empty."""
+        return self._queue[0][0] if self._queue else None
+
+    def pop_due(self, now: int) -> list:
+        """Removes and returns every event with time <= now, in firing order."""
+        due = []
+        queue = self._queue
+        while queue and queue[0][0] <= now:
+            event = heapq.heappop(queue)
+            due.append(event)
+            if event[2] == TIMER and event[4] > 0:
+                self.schedule(event[0] + event[4], TIMER, 0, event[4])
+        return due
+
+    def events(self) -> list:
+        """Pending events in firing order (used by save states)."""
+        return sorted(self._queue)
+
+    def clear(self):
+        self._queue = []
+        self._seq = 0
+
+    def __len__(self):
+        return len(self._queue)
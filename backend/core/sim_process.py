@@ -0,0 +1,272 @@
+"""
+Out-of-process simulator.
+
+The Computer runs in a separate process and publishes one fixed-layout record
+per micro-step into a multiprocessing.shared_memory ring buffer, next to a
+mirror of the RAM image. The GUI reads the newest record whenever it repaints;
+no pickling happens on the data path. Control commands (run/pause/step/reset/
+load/quit) travel over a Pipe as small tuples.
+
+Shared memory layout (little endian):
+
+    header   u64 records published, u32 slots, u32 RAM size   (padded to 64)
+    slots    `slots` records of RECORD
+    ram      RAM mirror, `RAM size` bytes
+
+Each record is framed by its sequence number at both ends; a reader that
+sees different numbers raced the writer and simply retries.
+"""
+import multiprocessing as mp
+import struct
+from multiprocessing import shared_memory
+
+from .savestate import REGISTER_ORDER
+
+# Bit positions for the names yielded by CPU.run_micro_step_generator
+COMPONENT_BITS = ('PC', 'MAR', 'RAM', 'MDR', 'IR', 'ALU', 'CU', 'ACC', 'FLAG', 'CPU_HALTED', 'CPU_WAITING')
+BUS_BITS = ('PC_MAR_BUS', 'ADDR_BUS', 'DATA_BUS', 'MDR_IR_BUS', 'PC_ALU_BUS', 'MDR_ACC_BUS')
+
+_COMPONENT_MASK = {name: 1 << i for i, name in enumerate(COMPONENT_BITS)}
+_BUS_MASK = {name: 1 << i for i, name in enumerate(BUS_BITS)}
+
+_HEADER = struct.Struct("<QII")
+HEADER_SIZE = 64
+# seq, cycles, registers, halted, waiting, stopped, component mask, bus mask,
+# changed RAM range [lo, hi), seq again. `stopped` is set when the simulator has
+# stopped running on its own (halted, or WAIT with nothing scheduled).
+RECORD = struct.Struct("<QQ6B???IIIIQ")
+
+DEFAULT_SLOTS = 64
+POLL_EVERY = 64  # Micro-steps between command checks at full speed
+
+
+def _mask(names, table) -> int:
+    mask = 0
+    for name in names:
+        mask |= table.get(name, 0)
+    return mask
+
+
+def _names(mask, order) -> set:
+    return {name for i, name in enumerate(order) if mask >> i & 1}
+
+
+class RingWriter:
+    """Simulator side of the shared ring buffer."""
+    def __init__(self, buf, slots, ram_size):
+        self.buf = buf
+        self.slots = slots
+        self.ram_offset = HEADER_SIZE + slots * RECORD.size
+        self.ram_size = ram_size
+        self.seq = 0
+
+    def sync_ram(self, ram, lo, hi):
+        """Copies RAM bytes [lo, hi) into the mirror (reads only that range)."""
+        self.buf[self.ram_offset + lo:self.ram_offset + hi] = ram.read_range(lo, hi)
+
+    def publish(self, state, lo=0, hi=0, stopped=False):
+        self.seq += 1
+        seq = self.seq
+        offset = HEADER_SIZE + (seq % self.slots) * RECORD.size
+        regs = state["registers"]
+        RECORD.pack_into(
+            self.buf, offset, seq, state["cycles"],
+            *(regs[name] & 0xFF for name in REGISTER_ORDER),
+            state["halted"], state["waiting"], stopped,
+            _mask(state["active_components"], _COMPONENT_MASK),
+            _mask(state["active_buses"], _BUS_MASK),
+            lo, hi, seq,
+        )
+        # Publish the record count last, after the record is complete
+        struct.pack_into("<Q", self.buf, 0, seq)
+
+
+def _worker_main(shm_name, conn, ram_size, slots):
+    """Entry point of the simulator process."""
+    from .computer import Computer
+
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        computer = Computer(ram_size)
+        cpu = computer.cpu
+        writer = RingWriter(shm.buf, slots, ram_size)
+        generator = None
+        running = False
+        interval = 0.0
+
+        def publish(state, lo=0, hi=0):
+            if hi > lo:
+                writer.sync_ram(computer.ram, lo, hi)
+            stopped = cpu.halted or (cpu.waiting and not len(cpu.scheduler))
+            writer.publish(state, lo, hi, stopped)
+
+        def micro_step():
+            nonlocal generator
+            if generator is None:
+                generator = computer.get_micro_step_generator()
+            stores = cpu.stores
+            try:
+                state = next(generator)
+            except StopIteration:
+                generator = computer.get_micro_step_generator()
+                state = next(generator)
+            if cpu.stores != stores:
+                # STA just wrote M(MAR)
+                address = cpu.rf.MAR.read()
+                publish(state, address, address + 1)
+            else:
+                publish(state)
+            return not (cpu.halted or (cpu.waiting and not len(cpu.scheduler)))  # Same test as `stopped`
+
+        publish(cpu._get_current_state(), 0, ram_size)
+        steps = 0
+        while True:
+            if not running or (interval == 0 and steps % POLL_EVERY == 0 and conn.poll()) \
+                    or (interval > 0 and conn.poll(interval)):
+                command, *args = conn.recv()
+                if command == 'quit':
+                    break
+                elif command == 'run':
+                    running, interval = True, args[0]
+                elif command == 'pause':
+                    running = False
+                elif command == 'step':
+                    micro_step()
+                elif command == 'reset':
+                    computer.reset()
+                    generator = None
+                    publish(cpu._get_current_state(), 0, ram_size)
+                elif command == 'load':
+                    program, start = args
+                    computer.load_program(program, start)
+                    publish(cpu._get_current_state(), start, min(start + len(program), ram_size))
+                continue
+
+            steps += 1
+            if not micro_step():
+                running = False
+    finally:
+        shm.close()
+        conn.close()
+
+
+class SimulatorProcess:
+    """
+    GUI side: owns the shared memory block and the simulator process.
+
+        sim = SimulatorProcess(); sim.start()
+        sim.load(program); sim.run()
+        state = sim.latest()      # newest state dict, or None if nothing new
+        sim.ram                   # zero-copy view of the RAM mirror
+        sim.close()
+    """
+    def __init__(self, ram_size=256, slots=DEFAULT_SLOTS):
+        self.ram_size = ram_size
+        self.slots = slots
+        self.ram_offset = HEADER_SIZE + slots * RECORD.size
+        self.shm = None
+        self.conn = None
+        self.process = None
+        self.last_seq = 0
+        self.ram_dirty = True
+
+    def start(self):
+        size = self.ram_offset + self.ram_size
+        self.shm = shared_memory.SharedMemory(create=True, size=size)
+        self.shm.buf[:size] = bytes(size)
+        _HEADER.pack_into(self.shm.buf, 0, 0, self.slots, self.ram_size)
+
+        # 'spawn' so the child never inherits a half-initialised Qt from the GUI process
+        ctx = mp.get_context('spawn')
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(
+            target=_worker_main,
+            args=(self.shm.name, child_conn, self.ram_size, self.slots),
+            daemon=True,
+        )
+        self.process.start()
+        child_conn.close()
+
+    # --- control commands ---
+
+    def send(self, *command):
+        self.conn.send(command)
+
+    def run(self, interval=0.0):
+        """Runs continuously; `interval` seconds between micro-steps (0 = full speed)."""
+        self.send('run', interval)
+
+    def pause(self):
+        self.send('pause')
+
+    def step(self):
+        self.send('step')
+
+    def reset(self):
+        self.send('reset')
+
+    def load(self, program, start=0):
+        self.send('load', bytes(program), start)
+
+    # --- data path ---
+
+    @property
+    def ram(self):
+        """Live view of the RAM mirror (no copy)."""
+        return self.shm.buf[self.ram_offset:self.ram_offset + self.ram_size]
+
+    def published(self) -> int:
+        return struct.unpack_from("<Q", self.shm.buf, 0)[0]
+
+    def latest(self):
+        """
+        Returns the newest state as a dictionary in the same format the micro-step
+        generator yields (plus "stopped"), or None if nothing was published since the last call.
+        Sets `ram_dirty` when RAM changed in any record since the previous call;
+        the caller clears it after refreshing its RAM display.
+        """
+        buf = self.shm.buf
+        while True:
+            newest = self.published()
+            if newest == self.last_seq:
+                return None
+            record = RECORD.unpack_from(buf, HEADER_SIZE + (newest % self.slots) * RECORD.size)
+            if record[0] == record[-1] == newest:
+                break  # Otherwise the writer lapped us mid-read; try again
+
+        if newest - self.last_seq > self.slots:
+            self.ram_dirty = True  # Skipped records were overwritten; assume RAM changed
+        else:
+            for seq in range(self.last_seq + 1, newest + 1):
+                lo, hi = RECORD.unpack_from(buf, HEADER_SIZE + (seq % self.slots) * RECORD.size)[13:15]
+                if hi > lo:
+                    self.ram_dirty = True
+                    break
+        self.last_seq = newest
+
+        _, cycles, *regs = record[:8]
+        halted, waiting, stopped, components, buses = record[8:13]
+        return {
+            "registers": dict(zip(REGISTER_ORDER, regs)),
+            "halted": halted,
+            "waiting": waiting,
+            "stopped": stopped,
+            "cycles": cycles,
+            "active_components": _names(components, COMPONENT_BITS),
+            "active_buses": _names(buses, BUS_BITS),
+        }
+
+    def close(self):
+        if self.process is not None:
+            try:
+                self.send('quit')
+            except (BrokenPipeError, OSError):
+                pass
+            self.process.join(timeout=2)
+            if self.process.is_alive():
+                self.process.terminate()
+            self.process = None
+        if self.shm is not None:
+            self.shm.close()
+            self.shm.unlink()
+            self.shm = None
@@ -0,0 +1,259 @@
+"""
+Exhaustive exploration of a program over every input device value.
+
+The explorer proves (or refutes) that a program halts for all 256 values of
+input_device_val. Execution up to the first IN does not depend on the input,
+so it runs once; that state becomes a checkpoint and is forked into one
+machine per input value. The forks then advance breadth-first, one
+instruction per level, and every state they reach is recorded as a 64-bit
+fingerprint in a compact open-addressing hash set. Seeing a fingerprint again
+means the branch is in a loop that will never halt. When static analysis
+shows that no reachable instruction writes RAM, memory is left out of the
+fingerprints.
+
+Inputs can be partitioned over worker processes. Fingerprints include the
+input value, so the partitions never share states.
+
+Usage:
+    python -m backend.tools.explorer program.hex [--max-steps 100000] [--workers 4]
+"""
+import argparse
+import hashlib
+import sys
+from array import array
+from multiprocessing import Pool
+
+from ..core.analysis import analyze
+from ..core.computer import Computer
+
+INPUT_VALUES = range(256)
+DEFAULT_MAX_STEPS = 100000
+
+# Branch outcomes
+HALT = "halt"
+LOOP = "loop"          # A machine state repeated: never halts
+BLOCKED = "blocked"    # WAIT with nothing scheduled to wake it
+UNKNOWN = "unknown"    # Step budget exhausted
+
+
+class FingerprintSet:
+    """
+    Set of 64-bit fingerprints stored in a flat array('Q') with linear probing:
+    8 bytes per slot instead of the ~70 bytes a Python set spends per int.
+    """
+    def __init__(self, capacity=1024):
+        self.capacity = capacity
+        self.slots = array('Q', bytes(8 * capacity))
+        self.count = 0
+
+    def add(self, fingerprint: int) -> bool:
+        """Adds a fingerprint; returns False if it was already present."""
+        fingerprint = fingerprint or 1  # 0 marks an empty slot
+        if self.count * 10 >= self.capacity * 7:
+            self._grow()
+        mask = self.capacity - 1
+        slots = self.slots
+        i = fingerprint & mask
+        while True:
+            current = slots[i]
+            if current == 0:
+                slots[i] = fingerprint
+                self.count += 1
+                return True
+            if current == fingerprint:
+                return False
+            i = (i + 1) & mask
+
+    def _grow(self):
+        old = self.slots
+        self.capacity *= 2
+        self.slots = array('Q', bytes(8 * self.capacity))
+        self.count = 0
+        for fingerprint in old:
+            if fingerprint:
+                self.add(fingerprint)
+
+    def __len__(self):
+        return self.count
+
+    @property
+    def nbytes(self) -> int:
+        return self.capacity * 8
+
+
+def fingerprint(computer, input_value, include_ram=True) -> int:
+    """
+    64-bit hash of everything that determines the machine's future (input value included).
+    include_ram=False is only valid when RAM can never change.
+    """
+    cpu = computer.cpu
+    rf = cpu.rf
+    digest = hashlib.blake2b(digest_size=8)
+    digest.update(bytes((rf.PC.read(), rf.ACC.read(), rf.FLAG.read(),
+                         cpu.halted, cpu.waiting, 0 if input_value is None else 1, input_value or 0)))
+    if include_ram:
+        digest.update(computer.ram.memory)
+    return int.from_bytes(digest.digest(), "little")
+
+
+def _outcome(computer):
+    cpu = computer.cpu
+    if cpu.halted:
+        return HALT
+    if cpu.waiting and not len(cpu.scheduler):
+        return BLOCKED
+    return None
+
+
+def run_prefix(computer, visited, max_steps, include_ram=True):
+    """
+    Runs the input-independent prefix up to the first IN.
+    Returns (outcome or None, steps); None means the next instruction is IN.
+    """
+    decode = computer.cpu.control_unit.decode
+    for steps in range(max_steps + 1):
+        outcome = _outcome(computer)
+        if outcome:
+            return outcome, steps
+        if not visited.add(fingerprint(computer, None, include_ram)):
+            return LOOP, steps
+        if steps == max_steps:
+            break
+        instruction = computer.ram.read(computer.cpu.rf.PC.read())
+        if decode(instruction)['name'] == 'IN' and not computer.cpu.waiting:
+            return None, steps
+        computer.run_single_macro_step()
+    return UNKNOWN, max_steps
+
+
+def explore_branches(checkpoint, inputs, start_steps, max_steps, include_ram=True):
+    """
+    Breadth-first exploration of the forks of `checkpoint` for the given input values.
+    Returns ({input: (outcome, steps)}, states visited, visited-set bytes).
+    """
+    visited = FingerprintSet()
+    results = {}
+    frontier = []
+    for value in inputs:
+        machine = Computer.from_bytes(checkpoint)
+        machine.cpu.input_device_val = value
+        frontier.append((value, machine))
+
+    steps = start_steps
+    while frontier:
+        survivors = []
+        for value, machine in frontier:
+            outcome = _outcome(machine)
+            if outcome is None and not visited.add(fingerprint(machine, value, include_ram)):
+                outcome = LOOP
+            if outcome is None and steps >= max_steps:
+                outcome = UNKNOWN
+            if outcome is not None:
+                results[value] = (outcome, steps)
+                continue
+            machine.run_single_macro_step()
+            survivors.append((value, machine))
+        frontier = survivors
+        steps += 1
+    return results, len(visited), visited.nbytes
+
+
+def _explore_worker(args):
+    return explore_branches(*args)
+
+
+def explore(computer, max_steps=DEFAULT_MAX_STEPS, workers=0, inputs=INPUT_VALUES) -> dict:
+    """
+    Explores the program loaded in `computer` (which is left untouched) for every input value.
+    """
+    if len(computer.cpu.scheduler):
+        raise ValueError("exploration assumes a static input device; clear scheduled events first")
+
+    root = Computer.from_bytes(computer.to_bytes())
+    # Without a reachable STA the RAM is constant, so registers identify the state
+    include_ram = bool(analyze(root.ram.memory, root.cpu.rf.PC.read()).writes)
+    prefix_visited = FingerprintSet()
+    outcome, prefix_steps = run_prefix(root, prefix_visited, max_steps, include_ram)
+    inputs = list(inputs)
+
+    if outcome is not None:
+        # Decided before the input was ever read: the same for every value
+        results = {value: (outcome, prefix_steps) for value in inputs}
+        states, nbytes = len(prefix_visited), prefix_visited.nbytes
+    else:
+        checkpoint = root.to_bytes()
+        if workers:
+            chunks = [inputs[i::workers] for i in range(workers)]
+            with Pool(workers) as pool:
+                parts = pool.map(_explore_worker,
+                                 [(checkpoint, chunk, prefix_steps, max_steps, include_ram)
+                                  for chunk in chunks if chunk])
+        else:
+            parts = [explore_branches(checkpoint, inputs, prefix_steps, max_steps, include_ram)]
+        results = {}
+        states, nbytes = len(prefix_visited), prefix_visited.nbytes
+        for part_results, part_states, part_bytes in parts:
+            results.update(part_results)
+            states += part_states
+            nbytes += part_bytes
+
+    by_outcome = {HALT: [], LOOP: [], BLOCKED: [], UNKNOWN: []}
+    for value in sorted(results):
+        by_outcome[results[value][0]].append(value)
+    halting_steps = [(results[v][1], v) for v in by_outcome[HALT]]
+    max_steps_taken, max_steps_input = max(halting_steps) if halting_steps else (0, None)
+
+    return {
+        "all_halt": len(by_outcome[HALT]) == len(inputs),
+        "halting": by_outcome[HALT],
+        "looping": by_outcome[LOOP],
+        "blocked": by_outcome[BLOCKED],
+        "unknown": by_outcome[UNKNOWN],
+        "input_independent_steps": prefix_steps,
+        "max_steps": max_steps_taken,
+        "max_steps_input": max_steps_input,
+        "states_visited": states,
+        "visited_set_bytes": nbytes,
+        "results": results,
+    }
+
+
+def _ranges(values) -> str:
+    """Compact 0-3,7,9-10 style listing."""
+    parts = []
+    for value in values:
+        if parts and parts[-1][1] == value - 1:
+            parts[-1][1] = value
+        else:
+            parts.append([value, value])
+    return ",".join(f"{a}" if a == b else f"{a}-{b}" for a, b in parts) or "-"
+
+
+def main(argv=None):
+    from ..cli import load_program_file
+
+    parser = argparse.ArgumentParser(description="Prove halting for every input device value.")
+    parser.add_argument("program", help="program image (.bin raw bytes, otherwise hex text)")
+    parser.add_argument("--start", type=lambda t: int(t, 0), default=0, help="load address")
+    parser.add_argument("--max-steps", type=int, default=DEFAULT_MAX_STEPS, help="instruction budget per input")
+    parser.add_argument("--workers", type=int, default=0, help="worker processes (0 = in-process)")
+    args = parser.parse_args(argv)
+
+    computer = Computer()
+    computer.load_program(load_program_file(args.program), args.start)
+    report = explore(computer, args.max_steps, args.workers)
+
+    print(f"halts for all inputs: {report['all_halt']}")
+    print(f"halting:  {_ranges(report['halting'])}")
+    print(f"looping:  {_ranges(report['looping'])}")
+    print(f"blocked:  {_ranges(report['blocked'])}")
+    print(f"unknown:  {_ranges(report['unknown'])}")
+    print(f"input-independent prefix: {report['input_independent_steps']} instructions")
+    if report["max_steps_input"] is not None:
+        print(f"max steps: {report['max_steps']} (input {report['max_steps_input']})")
+    print(f"states visited: {report['states_visited']} ({report['visited_set_bytes']} bytes of fingerprints)")
+    return 0 if report["all_halt"] else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
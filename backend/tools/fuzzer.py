@@ -0,0 +1,294 @@
+"""
+Differential fuzzer for the CPU execution paths.
+
+Random programs and input streams are run through every registered engine
+(the micro-step generator, run_single_macro_step, ...) and the architectural
+state is compared at each instruction boundary. Divergent cases are shrunk to
+a minimal program and saved as JSON so they can be replayed later.
+
+Usage:
+    python -m backend.tools.fuzzer --duration 60 --workers 8
+    python -m backend.tools.fuzzer --replay fuzz_failures/seed-123.json
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from multiprocessing import Pool, cpu_count
+
+from ..components.control_unit import ControlUnit
+from ..core.computer import Computer
+from ..core.savestate import REGISTER_ORDER
+
+# Registers every engine is expected to agree on (on top of the halted/waiting
+# flags, cycle counter, OUT values and RAM). Both paths leave IR/MAR/MDR in the
+# same state at instruction boundaries; --arch-registers compares only the
+# architectural ones.
+ARCH_REGISTERS = ("PC", "ACC", "FLAG")
+ALL_REGISTERS = REGISTER_ORDER
+
+PROGRAM_REGION = 16  # Operands are 4 bits, so programs live in 0x0-0xF
+DEFAULT_BUDGET = 32
+OPCODES = list(ControlUnit().OPCODES)
+
+
+def _step_micro(computer):
+    """One instruction through the GUI micro-step generator."""
+    for _ in computer.get_micro_step_generator():
+        pass
+
+
+def _step_macro(computer):
+    """One instruction through the legacy macro-step path."""
+    computer.run_single_macro_step()
+
+
+# Name -> callable executing exactly one instruction on a Computer.
+# New execution engines register themselves here to be fuzzed.
+ENGINES = {
+    "micro": _step_micro,
+    "macro": _step_macro,
+}
+
+
+def generate_case(seed: int, budget: int = DEFAULT_BUDGET) -> dict:
+    """Builds a random program and input stream, fully determined by the seed."""
+    rng = random.Random(seed)
+    program = []
+    for _ in range(rng.randint(1, PROGRAM_REGION)):
+        if rng.random() < 0.8:
+            # Mostly well-formed instructions, with some raw data bytes
+            program.append((rng.choice(OPCODES) << 4) | rng.randrange(16))
+        else:
+            program.append(rng.randrange(256))
+    # Input stream: values arriving at the input device at random cycles
+    inputs = sorted([rng.randrange(budget * 8), rng.randrange(256)] for _ in range(rng.randint(0, 4)))
+    return {"seed": seed, "program": program, "inputs": inputs, "budget": budget}
+
+
+def snapshot(computer: Computer, registers=ALL_REGISTERS) -> tuple:
+    """Comparable machine state at an instruction boundary."""
+    cpu = computer.cpu
+    regs = tuple(getattr(cpu.rf, name).read() for name in registers)
+    return regs, cpu.halted, bytes(computer.ram.memory), cpu.waiting, cpu.cycles, tuple(cpu.output)
+
+
+def describe(state: tuple, registers=ALL_REGISTERS) -> dict:
+    """Turns a snapshot into a JSON-friendly dictionary."""
+    regs, halted, memory, waiting, cycles, output = state
+    return {
+        "registers": dict(zip(registers, regs)),
+        "halted": halted,
+        "waiting": waiting,
+        "cycles": cycles,
+        "output": list(output),
+        "ram": memory[:PROGRAM_REGION].hex(),
+    }
+
+
+def run_case(case: dict, engines=None, registers=ALL_REGISTERS, machines=None):
+    """
+    Runs a case through every engine in lockstep.
+    Returns None if all engines agree, otherwise a description of the first divergence.
+    """
+    engines = engines or list(ENGINES)
+    if machines is None:
+        machines = {name: Computer() for name in engines}
+    for name in engines:
+        computer = machines[name]
+        computer.reset()
+        computer.load_program(case["program"])
+        for at, value in case["inputs"]:
+            computer.cpu.scheduler.schedule_input(at, value)
+
+    for step in range(case["budget"]):
+        states = {}
+        for name in engines:
+            computer = machines[name]
+            ENGINES[name](computer)
+            states[name] = snapshot(computer, registers)
+
+        reference = states[engines[0]]
+        if any(state != reference for state in states.values()):
+            return {
+                "step": step,
+                "states": {name: describe(s, registers) for name, s in states.items()},
+            }
+        if reference[1]:  # Every engine halted
+            return None
+    return None
+
+
+def shrink(case: dict, engines=None, registers=ALL_REGISTERS, machines=None) -> dict:
+    """
+    Greedily reduces a divergent case while it keeps diverging:
+    truncates the budget, drops input events, deletes bytes and replaces bytes with NOP.
+    """
+    def diverges(candidate):
+        return run_case(candidate, engines, registers, machines) is not None
+
+    best = dict(case, program=list(case["program"]), inputs=list(case["inputs"]))
+    divergence = run_case(best, engines, registers, machines)
+    if divergence is None:
+        return best
+    best["budget"] = divergence["step"] + 1
+
+    changed = True
+    while changed:
+        changed = False
+
+        for i in reversed(range(len(best["inputs"]))):
+            candidate = dict(best, inputs=best["inputs"][:i] + best["inputs"][i + 1:])
+            if diverges(candidate):
+                best, changed = candidate, True
+                continue
+            at, value = best["inputs"][i]
+            if value != 0:
+                candidate = dict(best, inputs=best["inputs"][:i] + [[at, 0]] + best["inputs"][i + 1:])
+                if diverges(candidate):
+                    best, changed = candidate, True
+
+        for i in reversed(range(len(best["program"]))):
+            if len(best["program"]) > 1:
+                candidate = dict(best, program=best["program"][:i] + best["program"][i + 1:])
+                if diverges(candidate):
+                    best, changed = candidate, True
+                    continue
+            if best["program"][i] != 0x00:
+                candidate = dict(best, program=best["program"][:i] + [0x00] + best["program"][i + 1:])
+                if diverges(candidate):
+                    best, changed = candidate, True
+
+        divergence = run_case(best, engines, registers, machines)
+        if divergence["step"] + 1 < best["budget"]:
+            best["budget"] = divergence["step"] + 1
+            changed = True
+
+    return best
+
+
+def _fuzz_batch(args):
+    """Worker entry point: fuzzes a contiguous range of seeds."""
+    first_seed, count, budget, engines, registers = args
+    machines = {name: Computer() for name in engines}
+    failures = []
+    for seed in range(first_seed, first_seed + count):
+        case = generate_case(seed, budget)
+        if run_case(case, engines, registers, machines) is not None:
+            minimal = shrink(case, engines, registers, machines)
+            failures.append({
+                "case": case,
+                "minimal": minimal,
+                "divergence": run_case(minimal, engines, registers, machines),
+            })
+    return count, failures
+
+
+def save_failure(directory: str, failure: dict) -> str:
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"seed-{failure['case']['seed']}.json")
+    with open(path, "w") as f:
+        json.dump(failure, f, indent=2)
+    return path
+
+
+def replay(path: str, engines=None, registers=ALL_REGISTERS) -> int:
+    """Re-runs a saved failure file. Returns a process exit code."""
+    with open(path) as f:
+        failure = json.load(f)
+    exit_code = 0
+    for key in ("minimal", "case"):
+        case = failure[key]
+        divergence = run_case(case, engines, registers)
+        program = " ".join(f"{b:02X}" for b in case["program"])
+        if divergence is None:
+            print(f"{key}: [{program}] no divergence")
+            continue
+        exit_code = 1
+        print(f"{key}: [{program}] diverges at instruction {divergence['step']}")
+        for name, state in divergence["states"].items():
+            print(f"  {name:>6}: {state}")
+    return exit_code
+
+
+def fuzz(duration=60.0, workers=None, batch=256, seed=0, budget=DEFAULT_BUDGET,
+         engines=None, registers=ALL_REGISTERS, out_dir="fuzz_failures", max_failures=100):
+    """
+    Runs the fuzzer until `duration` seconds elapse (forever if 0) or `max_failures`
+    distinct minimal cases have been saved. Returns (programs run, saved paths).
+    """
+    engines = engines or list(ENGINES)
+    workers = workers or cpu_count()
+    seen, saved = set(), []
+    total = 0
+    start = last_report = time.perf_counter()
+
+    def batches():
+        next_seed = seed
+        while True:
+            yield next_seed, batch, budget, engines, registers
+            next_seed += batch
+
+    with Pool(workers) as pool:
+        try:
+            for count, failures in pool.imap_unordered(_fuzz_batch, batches()):
+                total += count
+                for failure in failures:
+                    minimal = failure["minimal"]
+                    key = (tuple(minimal["program"]), tuple(map(tuple, minimal["inputs"])))
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    saved.append(save_failure(out_dir, failure))
+                    if len(saved) >= max_failures:
+                        break  # Don't write the rest of this batch's failures
+
+                now = time.perf_counter()
+                if now - last_report >= 5.0:
+                    rate = total / (now - start) * 60
+                    print(f"[fuzz] {total} programs, {rate:,.0f}/min, {len(saved)} distinct failures")
+                    last_report = now
+                if (duration and now - start >= duration) or len(saved) >= max_failures:
+                    break
+        except KeyboardInterrupt:
+            pass
+        pool.terminate()
+
+    elapsed = time.perf_counter() - start
+    print(f"[fuzz] done: {total} programs in {elapsed:.1f}s "
+          f"({total / max(elapsed, 1e-9) * 60:,.0f}/min), {len(saved)} distinct failures in {out_dir}/")
+    return total, saved
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Differential fuzzer for the CPU execution paths.")
+    parser.add_argument("--duration", type=float, default=60.0, help="seconds to run, 0 = until Ctrl-C")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--batch", type=int, default=256, help="programs per worker task")
+    parser.add_argument("--seed", type=int, default=0, help="first seed")
+    parser.add_argument("--budget", type=int, default=DEFAULT_BUDGET, help="instructions per program")
+    parser.add_argument("--engines", default=",".join(ENGINES), help="comma-separated engine names")
+    parser.add_argument("--arch-registers", action="store_true", help="compare only PC/ACC/FLAG, not IR/MAR/MDR")
+    parser.add_argument("--out", default="fuzz_failures", help="directory for failing seeds")
+    parser.add_argument("--max-failures", type=int, default=100, help="stop after this many distinct failures")
+    parser.add_argument("--replay", metavar="FILE", help="replay a saved failure instead of fuzzing")
+    args = parser.parse_args(argv)
+
+    engines = args.engines.split(",")
+    unknown = [name for name in engines if name not in ENGINES]
+    if unknown:
+        parser.error(f"unknown engine(s): {', '.join(unknown)}")
+    registers = ARCH_REGISTERS if args.arch_registers else ALL_REGISTERS
+
+    if args.replay:
+        return replay(args.replay, engines, registers)
+
+    _, saved = fuzz(args.duration, args.workers, args.batch, args.seed, args.budget,
+                    engines, registers, args.out, args.max_failures)
+    return 1 if saved else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -5,6 +5,27 @@ from PyQt5.QtCore import Qt, QRect, QPoint
 # We import our blueprint for all drawing instructions
 from . import circuit_layout as layout
 
+
+def draw_perf_overlay(painter: QPainter, monitor, rect: QRect):
+    """
+    Draws the performance overlay (FPS, steps/sec, latency percentiles) in the top-right corner.
+    Returns the rectangle it covered.
+    """
+    lines = monitor.overlay_lines()
+    font = QFont(layout.THEME["font"], layout.THEME["font_size"])
+    painter.setFont(font)
+    line_height = painter.fontMetrics().height()
+    width = max(painter.fontMetrics().width(line) for line in lines) + 16
+    box = QRect(rect.right() - width - 8, rect.top() + 8, width, line_height * len(lines) + 12)
+
+    painter.setPen(Qt.NoPen)
+    painter.setBrush(QColor(0, 0, 0, 180))
+    painter.drawRect(box)
+    painter.setPen(QColor(layout.THEME["component_border_active"]))
+    for i, line in enumerate(lines):
+        painter.drawText(box.left() + 8, box.top() + 6 + line_height * (i + 1) - painter.fontMetrics().descent(), line)
+    return box
+
 class CanvasWidget(QWidget):
     """
     The main drawing area for the computer architecture.
@@ -16,6 +37,8 @@ class CanvasWidget(QWidget):
         self.setMinimumSize(800, 600)
         # The 'state' dictionary holds all the real-time data from the backend
         self.state = {} 
+        # Optional PerfMonitor (see perf_monitor.py); None means no instrumentation
+        self.perf = None
 
     def update_state(self, new_state: dict):
         """
@@ -30,6 +53,7 @@ class CanvasWidget(QWidget):
         Handles all the drawing. It's called automatically when self.update() is invoked.
         The drawing process is executed in a specific order to ensure correct layering.
         """
+        start = self.perf.now() if self.perf else 0.0
         painter = QPainter(self)
         painter.setRenderHint(QPainter.Antialiasing)
 
@@ -42,6 +66,12 @@ class CanvasWidget(QWidget):
         # 3. Draw all the component boxes on top of the wires
         self._draw_components(painter)
 
+        # 4. Optional performance overlay (not included in the measured paint time)
+        if self.perf:
+            self.perf.record("paint", start)
+            if self.perf.overlay_visible:
+                draw_perf_overlay(painter, self.perf, self.rect())
+
     def _draw_components(self, painter: QPainter):
         """Draws all the component rectangles and their labels."""
         active_comps = self.state.get("active_components", set())
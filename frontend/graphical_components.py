@@ -11,6 +11,30 @@ BUS_PULSE_COLOR = QColor("#f1c40f") # Yellow
 COMPONENT_BG_COLOR = QColor("#ecf0f1") # Light Grey
 COMPONENT_BORDER_COLOR = QColor("#7f8c8d") # Grey
 CPU_BG_COLOR = QColor(240, 240, 240, 200)
+HIGHLIGHT_COLOR = QColor("gold")
+# RAM byte colours per region from backend.core.analysis.ProgramAnalysis.regions()
+REGION_COLORS = {'code': "blue", 'data': "green", 'smc': "red", 'dead': "gray"}
+
+# Every item renders into its own device-space pixmap cache, so panning and
+# zooming blit cached pixmaps and a highlight only repaints the item it touches.
+CACHE_MODE = QGraphicsItem.DeviceCoordinateCache
+
+class HighlightMixin:
+    """
+    highlight()/unhighlight() for shape items with a brush. Only a real change
+    calls setBrush, so a cached item is not repainted on every micro-step.
+    """
+    highlighted = False
+
+    def highlight(self, color=HIGHLIGHT_COLOR):
+        if not self.highlighted:
+            self.highlighted = True
+            self.setBrush(color)
+
+    def unhighlight(self):
+        if self.highlighted:
+            self.highlighted = False
+            self.setBrush(COMPONENT_BG_COLOR)
 
 class Port(QGraphicsEllipseItem):
     """A small circle representing an input/output pin on a component."""
@@ -18,37 +42,47 @@ class Port(QGraphicsEllipseItem):
         super().__init__(-PIN_RADIUS, -PIN_RADIUS, PIN_RADIUS*2, PIN_RADIUS*2, parent)
         self.setBrush(PORT_COLOR)
         self.setPen(QPen(Qt.black, 1.5))
+        self.setCacheMode(CACHE_MODE)
 
-class RegisterItem(QGraphicsRectItem):
+class RegisterItem(HighlightMixin, QGraphicsRectItem):
     """A detailed visual representation of a single register."""
     def __init__(self, name, parent=None):
         super().__init__(0, 0, 100, 45, parent)
         self.setBrush(COMPONENT_BG_COLOR)
         self.setPen(QPen(COMPONENT_BORDER_COLOR, 1.5))
         self.setToolTip(f"Register {name}")
+        self.setCacheMode(CACHE_MODE)
+        self.value = 0
 
         self.name_text = QGraphicsTextItem(name, self)
         self.name_text.setPos(5, 1)
+        self.name_text.setCacheMode(CACHE_MODE)
         
         self.value_text = QGraphicsTextItem("0x00", self)
         self.value_text.setPos(25, 15)
         self.value_text.setFont(QFont("Courier New", 13, QFont.Bold))
+        self.value_text.setCacheMode(CACHE_MODE)
 
     def update_value(self, value):
-        self.value_text.setPlainText(f"0x{value:02X}")
+        # Unchanged values must not invalidate the cached text pixmap
+        if value != self.value:
+            self.value = value
+            self.value_text.setPlainText(f"0x{value:02X}")
         
-    def highlight(self, color=QColor("gold")):
-        self.setBrush(color)
-
-    def unhighlight(self):
-        self.setBrush(COMPONENT_BG_COLOR)
+    def set_detail(self, visible: bool):
+        """Level of detail: hides the text when zoomed far out."""
+        self.name_text.setVisible(visible)
+        self.value_text.setVisible(visible)
 
-class RamItem(QGraphicsRectItem):
+class RamItem(HighlightMixin, QGraphicsRectItem):
     """A Logisim-style RAM component."""
     def __init__(self, x, y, size, parent=None):
         super().__init__(x, y, 180, 350, parent)
         self.setBrush(COMPONENT_BG_COLOR)
         self.setPen(QPen(COMPONENT_BORDER_COLOR, 2))
+        self.setCacheMode(CACHE_MODE)
+        self.shown_bytes = None
+        self.regions = {}
         
         self.title = QGraphicsTextItem("RAM", self)
         self.title.setFont(QFont("Arial", 14, QFont.Bold))
@@ -57,6 +91,7 @@ class RamItem(QGraphicsRectItem):
         self.mem_display = QGraphicsTextItem(self)
         self.mem_display.setPos(x + 15, y + 40)
         self.mem_display.setFont(QFont("Courier New", 10))
+        self.mem_display.setCacheMode(CACHE_MODE)
         
         self.ports = {
             'addr_in': Port(self),
@@ -66,16 +101,29 @@ class RamItem(QGraphicsRectItem):
         self.ports['data_io'].setPos(x, y + 160)
 
     def update_memory(self, memory_array):
-        # Display first 16 bytes
-        display_text = ""
-        for i in range(16):
-            display_text += f"0x{i:02X}: <b style='color:blue;'>{memory_array[i]:02X}</b>\n"
+        # Display first 16 bytes; rebuilding the HTML is expensive, so skip it when nothing changed
+        shown = bytes(memory_array[:16])
+        if shown == self.shown_bytes:
+            return
+        self.shown_bytes = shown
+        display_text = "<br>".join(
+            f"0x{i:02X}: <b style='color:{REGION_COLORS.get(self.regions.get(i), 'blue')};'>{value:02X}</b>"
+            for i, value in enumerate(shown)
+        )
         self.mem_display.setHtml(display_text)
+
+    def set_regions(self, regions: dict):
+        """Colours bytes by static-analysis region (address -> 'code'/'data'/'smc'/'dead')."""
+        self.regions = regions
+        self.shown_bytes = None  # Force the next update_memory to rebuild the text
+
+    def set_detail(self, visible: bool):
+        self.mem_display.setVisible(visible)
         
     def get_port_pos(self, name):
         return self.ports.get(name).scenePos()
 
-class AluItem(QGraphicsPathItem):
+class AluItem(HighlightMixin, QGraphicsPathItem):
     """A trapezoidal ALU symbol."""
     def __init__(self, parent=None):
         path = QPainterPath()
@@ -88,6 +136,7 @@ class AluItem(QGraphicsPathItem):
         
         self.setBrush(COMPONENT_BG_COLOR)
         self.setPen(QPen(COMPONENT_BORDER_COLOR, 1.5))
+        self.setCacheMode(CACHE_MODE)
         
         self.title = QGraphicsTextItem("ALU", self)
         self.title.setPos(self.boundingRect().width()/2 - self.title.boundingRect().width()/2, 40)
@@ -98,6 +147,7 @@ class CpuItem(QGraphicsRectItem):
         super().__init__(x, y, 450, 400, parent)
         self.setBrush(CPU_BG_COLOR)
         self.setPen(QPen(Qt.darkGray, 2, Qt.DashLine))
+        self.setCacheMode(CACHE_MODE)
 
         self.title = QGraphicsTextItem("CPU", self)
         self.title.setFont(QFont("Arial", 16, QFont.Bold))
@@ -110,6 +160,8 @@ class CpuItem(QGraphicsRectItem):
         self.cu = QGraphicsRectItem(x + 250, y + 80, 150, 100, self)
         self.cu.setBrush(COMPONENT_BG_COLOR)
         self.cu.setPen(QPen(COMPONENT_BORDER_COLOR, 1.5))
+        self.cu.setCacheMode(CACHE_MODE)
+        self.cu_active = False
         cu_text = QGraphicsTextItem("Control Unit", self.cu)
         cu_text.setPos(self.cu.rect().center().x() - cu_text.boundingRect().width()/2, 
                        self.cu.rect().center().y() - cu_text.boundingRect().height()/2)
@@ -118,6 +170,7 @@ class CpuItem(QGraphicsRectItem):
         reg_file_box = QGraphicsRectItem(x + 20, y + 220, 410, 160, self)
         reg_file_box.setBrush(QColor(220, 220, 220, 150))
         reg_file_box.setPen(QPen(Qt.darkGray, 1, Qt.DotLine))
+        reg_file_box.setCacheMode(CACHE_MODE)
         
         self.registers = {
             'PC': RegisterItem("PC", self), 'ACC': RegisterItem("ACC", self), 'IR': RegisterItem("IR", self),
@@ -140,17 +193,27 @@ class CpuItem(QGraphicsRectItem):
     def get_port_pos(self, name):
         return self.ports.get(name).scenePos()
 
-    def update_registers(self, register_file):
-        self.registers['PC'].update_value(register_file.PC.read())
-        self.registers['ACC'].update_value(register_file.R0.read())
-        self.registers['IR'].update_value(register_file.IR.read())
-        self.registers['MAR'].update_value(register_file.AR.read())
-        self.registers['MDR'].update_value(register_file.DR2.read())
-        self.registers['FLAG'].update_value(register_file.FLAGS.read())
+    def update_registers(self, registers: dict):
+        """
+        Updates the register displays from RegisterFile.read_all() output
+        (the "registers" entry of the backend state), keyed by the real register names.
+        """
+        for name, item in self.registers.items():
+            if name in registers:
+                item.update_value(registers[name])
             
     def get_register_item(self, name):
         return self.registers.get(name)
 
+    def highlight_cu(self, active: bool):
+        if active != self.cu_active:
+            self.cu_active = active
+            self.cu.setBrush(HIGHLIGHT_COLOR if active else COMPONENT_BG_COLOR)
+
+    def set_detail(self, visible: bool):
+        for item in self.registers.values():
+            item.set_detail(visible)
+
 class Bus(QGraphicsPathItem):
     """A bus that uses orthogonal lines and can be pulsed."""
     def __init__(self, start_pos, end_pos, two_way=False):
@@ -159,6 +222,8 @@ class Bus(QGraphicsPathItem):
         self.end_pos = end_pos
         self.pen = QPen(BUS_COLOR, 3)
         self.setPen(self.pen)
+        self.setCacheMode(CACHE_MODE)
+        self.active = False
         self.draw_path()
 
     def draw_path(self):
@@ -174,4 +239,10 @@ class Bus(QGraphicsPathItem):
         QTimer.singleShot(duration, self.reset_pen)
 
     def reset_pen(self):
-        self.setPen(self.pen)
\ No newline at end of file
+        self.setPen(self.pen)
+
+    def set_active(self, active: bool):
+        """Steady highlight for the bus while a micro-step drives it."""
+        if active != self.active:
+            self.active = active
+            self.setPen(QPen(BUS_PULSE_COLOR, 4.5) if active else self.pen)
@@ -53,6 +53,8 @@ class LeftPanel(QWidget):
         self.main_layout.setAlignment(Qt.AlignTop)
 
         self.info_widgets = {}
+        # Optional PerfMonitor (see perf_monitor.py)
+        self.perf = None
 
         self._create_section("REGISTERS", ["PC", "ACC", "IR", "MAR", "MDR", "FLAG"])
         self._create_section("STATUS", ["HALTED"])
@@ -79,6 +81,7 @@ class LeftPanel(QWidget):
         """
         Public method to receive the latest state and update all display widgets.
         """
+        start = self.perf.now() if self.perf else 0.0
         # Update register values
         if "registers" in new_state:
             for name, value in new_state["registers"].items():
@@ -89,4 +92,7 @@ class LeftPanel(QWidget):
         if "halted" in new_state:
             halted_status = 1 if new_state["halted"] else 0
             if "HALTED" in self.info_widgets:
-                self.info_widgets["HALTED"].set_value(halted_status)
\ No newline at end of file
+                self.info_widgets["HALTED"].set_value(halted_status)
+
+        if self.perf:
+            self.perf.record("panel", start)
@@ -1,22 +1,37 @@
 import sys
-from PyQt5.QtWidgets import QMainWindow, QApplication, QWidget, QHBoxLayout, QToolBar, QAction
+from PyQt5.QtWidgets import QMainWindow, QApplication, QWidget, QHBoxLayout, QToolBar, QAction, QStackedWidget
 from PyQt5.QtCore import QTimer, Qt
 from PyQt5.QtGui import QIcon # Optional, for icons on buttons
 
 from backend.core.computer import Computer
+from backend.core.analysis import analyze
 from .canvas_widget import CanvasWidget
+from .scene_canvas import SceneCanvas
+from .perf_monitor import PerfMonitor
 from .left_panel import LeftPanel
 from . import circuit_layout as layout
 
+# Demonstration program loaded on every reset
+DEFAULT_PROGRAM = [0x44, 0x46, 0x98, 0x81, 0xF5, 0x0C, 0x00, 0x60]
+# Repaint rate when the simulator runs in another process
+REMOTE_FRAME_MS = 16
+
 class MainWindow(QMainWindow):
     """
     The main application window. It orchestrates the UI components (LeftPanel, CanvasWidget)
     and manages the simulation flow by interacting with the backend computer model.
     """
-    def __init__(self, computer: Computer):
+    def __init__(self, computer: Computer, perf_monitor: PerfMonitor = None, perf_dump_path: str = None,
+                 simulator=None):
         super().__init__()
         self.computer = computer
         self.micro_step_generator = None
+        # Optional backend.core.sim_process.SimulatorProcess: when set, the Computer
+        # runs in another process and this window only sends commands and reads states
+        self.simulator = simulator
+        # Opt-in instrumentation: None disables all timing
+        self.perf = perf_monitor
+        self.perf_dump_path = perf_dump_path
 
         self.setWindowTitle("projectCAS - Turing Complete Visualizer")
         self.setGeometry(50, 50, 1400, 800)
@@ -33,13 +48,27 @@ class MainWindow(QMainWindow):
         # --- UI Components ---
         self.left_panel = LeftPanel()
         self.canvas = CanvasWidget()
+        self.scene_canvas = SceneCanvas()
+        # Only one canvas is visible at a time; the stack switches between render modes
+        self.canvas_stack = QStackedWidget()
+        self.canvas_stack.addWidget(self.canvas)
+        self.canvas_stack.addWidget(self.scene_canvas)
+        self.active_canvas = self.canvas
+        self.last_state = {}
+        for widget in (self.canvas, self.scene_canvas, self.left_panel):
+            widget.perf = self.perf
         
         self.main_layout.addWidget(self.left_panel)
-        self.main_layout.addWidget(self.canvas, 1) # The '1' gives the canvas more stretch space
+        self.main_layout.addWidget(self.canvas_stack, 1) # The '1' gives the canvas more stretch space
 
         # --- Simulation Timer ---
         self.simulation_timer = QTimer(self)
         self.simulation_timer.timeout.connect(self.do_one_micro_step)
+        if self.simulator:
+            # Remote mode: the timer only picks up the newest published state each frame
+            self.frame_timer = QTimer(self)
+            self.frame_timer.timeout.connect(self.poll_simulator)
+            self.frame_timer.start(REMOTE_FRAME_MS)
         
         self.create_toolbar()
         self.reset_computer() # Initialize the view on startup
@@ -76,8 +105,27 @@ class MainWindow(QMainWindow):
         reset_action.triggered.connect(self.reset_computer)
         toolbar.addAction(reset_action)
 
+        # Render mode toggle: QPainter canvas <-> cached QGraphicsScene view
+        self.scene_view_action = QAction("Scene View", self, checkable=True)
+        self.scene_view_action.toggled.connect(self.toggle_scene_view)
+        toolbar.addAction(self.scene_view_action)
+
+        if self.perf:
+            perf_action = QAction("Perf Overlay", self, checkable=True)
+            perf_action.setChecked(self.perf.overlay_visible)
+            perf_action.toggled.connect(self.toggle_perf_overlay)
+            toolbar.addAction(perf_action)
+
     def toggle_run(self, checked: bool):
         """Starts or stops the continuous simulation timer."""
+        if self.simulator:
+            # The simulator process runs at full speed on its own core
+            self.run_action.setText("Pause" if checked else "Run")
+            if checked:
+                self.simulator.run()
+            else:
+                self.simulator.pause()
+            return
         if checked:
             self.run_action.setText("Pause")
             self.simulation_timer.start(250) # Time in ms per micro-step
@@ -85,8 +133,50 @@ class MainWindow(QMainWindow):
             self.run_action.setText("Run")
             self.simulation_timer.stop()
 
+    def toggle_scene_view(self, checked: bool):
+        """Switches the render mode and brings the newly shown canvas up to date."""
+        self.active_canvas = self.scene_canvas if checked else self.canvas
+        self.canvas_stack.setCurrentWidget(self.active_canvas)
+        self.distribute_state(self.last_state)
+
+    def toggle_perf_overlay(self, checked: bool):
+        self.perf.overlay_visible = checked
+        if self.active_canvas is self.scene_canvas:
+            self.scene_canvas.viewport().update()
+        else:
+            self.canvas.update()
+
+    def distribute_state(self, state: dict):
+        """Sends a backend state to the visible canvas and the left panel."""
+        start = self.perf.now() if self.perf else 0.0
+        self.last_state = state
+        self.active_canvas.update_state(state)
+        if self.active_canvas is self.scene_canvas:
+            if not self.simulator:
+                self.scene_canvas.set_memory(self.computer.ram.memory)
+            elif self.simulator.ram_dirty:
+                self.scene_canvas.set_memory(self.simulator.ram)
+                self.simulator.ram_dirty = False
+        self.left_panel.update_state(state)
+        if self.perf:
+            self.perf.record("distribute", start)
+
+    def poll_simulator(self):
+        """Shows the newest state published by the simulator process, if there is a new one."""
+        state = self.simulator.latest()
+        if state is None:
+            return
+        # The process stops by itself on HALT and on a WAIT nothing can wake
+        if state["stopped"] and self.run_action.isChecked():
+            self.run_action.setChecked(False)
+        self.distribute_state(state)
+
     def do_one_micro_step(self):
         """Executes a single micro-step and updates the entire UI."""
+        if self.simulator:
+            self.simulator.step()
+            return
+
         if self.run_action.isChecked() and self.simulation_timer.isActive() == False:
              self.run_action.setChecked(False) # Stop if we reach the end in run mode
              return
@@ -97,10 +187,12 @@ class MainWindow(QMainWindow):
         
         try:
             # Fetch the next state from the backend's generator
+            start = self.perf.now() if self.perf else 0.0
             state = next(self.micro_step_generator)
+            if self.perf:
+                self.perf.record("step", start)
             # Distribute the new state to all frontend components that need it
-            self.canvas.update_state(state)
-            self.left_panel.update_state(state)
+            self.distribute_state(state)
         except StopIteration:
             # The current macro instruction is finished.
             self.micro_step_generator = None
@@ -111,18 +203,38 @@ class MainWindow(QMainWindow):
 
     def reset_computer(self):
         """Resets the backend computer and the entire UI to its initial state."""
-        if self.simulation_timer.isActive():
+        if self.run_action.isChecked():
             self.run_action.setChecked(False) # This will also stop the timer
         
+        if self.simulator:
+            self.simulator.reset()
+            self.simulator.load(DEFAULT_PROGRAM)
+            # Colour the RAM display by code/data region, analysing the full RAM image the process loaded
+            image = bytearray(self.simulator.ram_size)
+            image[:len(DEFAULT_PROGRAM)] = bytes(DEFAULT_PROGRAM)
+            self.scene_canvas.set_analysis(analyze(image))
+            print("Simulator process has been reset and program is loaded.")
+            return
+
         self.computer.reset()
         # For demonstration, load the default program upon reset
-        program_code = [0x44, 0x46, 0x98, 0x81, 0xF5, 0x0C, 0x00, 0x60]
-        self.computer.load_program(program_code)
+        self.computer.load_program(DEFAULT_PROGRAM)
+        # Colour the RAM display by code/data region; the analysis is cached by image hash
+        self.scene_canvas.set_analysis(analyze(self.computer.ram.memory))
         
         self.micro_step_generator = None
         # Get the initial state from the reset computer
         initial_state = self.computer.cpu._get_current_state()
         # Update UI to reflect the initial state
-        self.canvas.update_state(initial_state)
-        self.left_panel.update_state(initial_state)
-        print("Computer has been reset and program is loaded.")
\ No newline at end of file
+        self.distribute_state(initial_state)
+        print("Computer has been reset and program is loaded.")
+
+    def closeEvent(self, event):
+        """Dumps the performance histograms to JSON on exit when instrumentation is enabled."""
+        if self.perf and self.perf_dump_path:
+            self.perf.dump_json(self.perf_dump_path)
+            print(f"Performance report written to {self.perf_dump_path}")
+        if self.simulator:
+            self.frame_timer.stop()
+            self.simulator.close()
+        super().closeEvent(event)
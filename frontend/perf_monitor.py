@@ -0,0 +1,117 @@
+import json
+import time
+from array import array
+
+# Number of samples kept per series; older samples are overwritten
+DEFAULT_CAPACITY = 2048
+# Frames/steps used for the FPS and steps/sec estimates
+RATE_WINDOW = 120
+
+
+class RingHistogram:
+    """
+    Fixed-size ring buffer of duration samples (milliseconds).
+    Storage is preallocated once, so recording a sample never allocates.
+    """
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        self.capacity = capacity
+        self.samples = array('d', bytes(8 * capacity))
+        self.index = 0
+        self.count = 0
+        self.total = 0  # Samples ever recorded
+
+    def add(self, value: float):
+        self.samples[self.index] = value
+        self.index = (self.index + 1) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+        self.total += 1
+
+    def percentiles(self, points=(50, 95, 99)) -> dict:
+        """Nearest-rank percentiles over the samples currently in the ring."""
+        if self.count == 0:
+            return {f"p{p}": 0.0 for p in points}
+        ordered = sorted(self.samples[:self.count])
+        last = self.count - 1
+        return {f"p{p}": ordered[min(last, int(round(p / 100 * last)))] for p in points}
+
+    def summary(self) -> dict:
+        result = self.percentiles()
+        result["samples"] = self.count
+        result["total"] = self.total
+        result["max"] = max(self.samples[:self.count]) if self.count else 0.0
+        return result
+
+
+class RateMeter:
+    """Events per second over the last `window` events (timestamps in a ring)."""
+    def __init__(self, window=RATE_WINDOW):
+        self.window = window
+        self.stamps = array('d', bytes(8 * window))
+        self.index = 0
+        self.count = 0
+
+    def tick(self, now: float):
+        self.stamps[self.index] = now
+        self.index = (self.index + 1) % self.window
+        if self.count < self.window:
+            self.count += 1
+
+    def rate(self) -> float:
+        if self.count < 2:
+            return 0.0
+        newest = self.stamps[(self.index - 1) % self.window]
+        oldest = self.stamps[(self.index - self.count) % self.window]
+        return (self.count - 1) / (newest - oldest) if newest > oldest else 0.0
+
+
+class PerfMonitor:
+    """
+    Opt-in frontend instrumentation.
+    Series (all in ms):
+        step        backend next() on the micro-step generator
+        distribute  pushing one state to the canvas and the left panel
+        panel       LeftPanel.update_state
+        paint       paintEvent of the visible canvas
+    plus FPS (paints/sec) and steps/sec.
+    """
+    SERIES = ("step", "distribute", "panel", "paint")
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        self.series = {name: RingHistogram(capacity) for name in self.SERIES}
+        self.frames = RateMeter()
+        self.steps = RateMeter()
+        self.overlay_visible = True
+
+    @staticmethod
+    def now() -> float:
+        return time.perf_counter()
+
+    def record(self, name: str, start: float) -> float:
+        """Records the time elapsed since `start` (from now()) and returns the current time."""
+        end = time.perf_counter()
+        self.series[name].add((end - start) * 1000)
+        if name == "paint":
+            self.frames.tick(end)
+        elif name == "step":
+            self.steps.tick(end)
+        return end
+
+    def overlay_lines(self) -> list:
+        """Short text lines for the on-canvas overlay."""
+        lines = [f"FPS {self.frames.rate():5.1f}   steps/s {self.steps.rate():7.1f}"]
+        for name in self.SERIES:
+            p = self.series[name].percentiles()
+            lines.append(f"{name:<10} p50 {p['p50']:6.2f}  p95 {p['p95']:6.2f}  p99 {p['p99']:6.2f} ms")
+        return lines
+
+    def report(self) -> dict:
+        return {
+            "fps": self.frames.rate(),
+            "steps_per_sec": self.steps.rate(),
+            "series_ms": {name: hist.summary() for name, hist in self.series.items()},
+        }
+
+    def dump_json(self, path: str):
+        with open(path, "w") as f:
+            json.dump(self.report(), f, indent=2)
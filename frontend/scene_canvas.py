@@ -0,0 +1,148 @@
+from PyQt5.QtWidgets import QGraphicsView, QGraphicsScene
+from PyQt5.QtGui import QPainter, QColor
+
+from .graphical_components import CpuItem, RamItem, Bus
+from .canvas_widget import draw_perf_overlay
+from . import circuit_layout as layout
+
+# Below this zoom factor text is hidden and components are drawn as plain boxes
+LOD_THRESHOLD = 0.5
+ZOOM_STEP = 1.15
+ZOOM_RANGE = (0.1, 8.0)
+
+CPU_POS = (0, 0)
+RAM_POS = (560, 25)
+
+
+class SceneCanvas(QGraphicsView):
+    """
+    Alternative canvas built on QGraphicsScene and the items in graphical_components.
+    Every item uses DeviceCoordinateCache, so zooming/panning blits cached pixmaps
+    and a micro-step only repaints the items whose highlight or value changed.
+    It accepts the same state dictionary as CanvasWidget.update_state.
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setMinimumSize(800, 600)
+        # Optional PerfMonitor (see perf_monitor.py); set before the scene can trigger scrolling
+        self.perf = None
+        self.overlay_rect = None
+
+        self.scene = QGraphicsScene(self)
+        self.scene.setBackgroundBrush(QColor(layout.THEME["background"]))
+        self.setScene(self.scene)
+
+        self.setRenderHint(QPainter.Antialiasing)
+        self.setViewportUpdateMode(QGraphicsView.MinimalViewportUpdate)
+        self.setOptimizationFlag(QGraphicsView.DontSavePainterState)
+        self.setCacheMode(QGraphicsView.CacheBackground)
+        self.setDragMode(QGraphicsView.ScrollHandDrag)
+        self.setTransformationAnchor(QGraphicsView.AnchorUnderMouse)
+
+        self._build_scene()
+
+        self.active_components = set()
+        self.active_buses = set()
+        self.detail_visible = True
+
+    def _build_scene(self):
+        self.cpu = CpuItem(*CPU_POS)
+        self.ram = RamItem(*RAM_POS, 256)
+        self.scene.addItem(self.cpu)
+        self.scene.addItem(self.ram)
+
+        def center(item):
+            return item.sceneBoundingRect().center()
+
+        regs = self.cpu.registers
+        # Bus names match the ones yielded by the backend micro-step generator
+        self.buses = {
+            "ADDR_BUS": Bus(self.cpu.get_port_pos('addr_out'), self.ram.get_port_pos('addr_in')),
+            "DATA_BUS": Bus(self.cpu.get_port_pos('data_io'), self.ram.get_port_pos('data_io')),
+            "PC_MAR_BUS": Bus(center(regs['PC']), center(regs['MAR'])),
+            "MDR_IR_BUS": Bus(center(regs['MDR']), center(regs['IR'])),
+            "MDR_ACC_BUS": Bus(center(regs['MDR']), center(regs['ACC'])),
+            "PC_ALU_BUS": Bus(center(regs['PC']), center(self.cpu.alu)),
+        }
+        for bus in self.buses.values():
+            bus.setZValue(1)
+            self.scene.addItem(bus)
+
+        # Backend component name -> item with highlight()/unhighlight()
+        self.highlightable = dict(regs)
+        self.highlightable['ALU'] = self.cpu.alu
+        self.highlightable['RAM'] = self.ram
+
+        self.scene.setSceneRect(self.scene.itemsBoundingRect().adjusted(-40, -40, 40, 40))
+
+    def update_state(self, new_state: dict):
+        """
+        Public method to receive the latest state from the backend.
+        Only items whose value or highlight actually changed are invalidated.
+        """
+        if "registers" in new_state:
+            self.cpu.update_registers(new_state["registers"])
+
+        active = new_state.get("active_components", set())
+        for name in self.active_components ^ active:
+            if name == 'CU':
+                self.cpu.highlight_cu(name in active)
+            elif name in self.highlightable:
+                if name in active:
+                    self.highlightable[name].highlight()
+                else:
+                    self.highlightable[name].unhighlight()
+        self.active_components = set(active)
+
+        buses = new_state.get("active_buses", set())
+        for name in self.active_buses ^ buses:
+            if name in self.buses:
+                self.buses[name].set_active(name in buses)
+        self.active_buses = set(buses)
+        self.refresh_overlay()
+
+    def set_memory(self, memory):
+        """Refreshes the RAM contents display (no-op if the shown bytes are unchanged)."""
+        self.ram.update_memory(memory)
+
+    def set_analysis(self, analysis):
+        """Colours the RAM display by region (a backend.core.analysis.ProgramAnalysis, or None)."""
+        self.ram.set_regions(analysis.regions() if analysis else {})
+
+    def paintEvent(self, event):
+        if not self.perf:
+            super().paintEvent(event)
+            return
+        start = self.perf.now()
+        super().paintEvent(event)
+        self.perf.record("paint", start)
+        if self.perf.overlay_visible:
+            # Drawn on top of the viewport in widget coordinates, unaffected by zoom
+            painter = QPainter(self.viewport())
+            self.overlay_rect = draw_perf_overlay(painter, self.perf, self.viewport().rect())
+            painter.end()
+
+    def refresh_overlay(self):
+        """Repaints just the overlay area; the rest of the scene stays cached."""
+        if self.perf and self.perf.overlay_visible and self.overlay_rect is not None:
+            self.viewport().update(self.overlay_rect)
+
+    def scrollContentsBy(self, dx, dy):
+        # Scrolling copies viewport pixels, which would drag the overlay along
+        super().scrollContentsBy(dx, dy)
+        self.refresh_overlay()
+
+    def wheelEvent(self, event):
+        """Zooms around the mouse cursor, clamped to ZOOM_RANGE."""
+        factor = ZOOM_STEP if event.angleDelta().y() > 0 else 1 / ZOOM_STEP
+        zoom = self.transform().m11() * factor
+        if ZOOM_RANGE[0] <= zoom <= ZOOM_RANGE[1]:
+            self.scale(factor, factor)
+            self._update_level_of_detail()
+
+    def _update_level_of_detail(self):
+        visible = self.transform().m11() >= LOD_THRESHOLD
+        if visible != self.detail_visible:
+            self.detail_visible = visible
+            self.cpu.set_detail(visible)
+            self.ram.set_detail(visible)
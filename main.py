@@ -1,4 +1,4 @@
-from core.computer import Computer
+from backend.core.computer import Computer
 
 def main():
     """
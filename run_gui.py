@@ -1,7 +1,10 @@
+import os
 import sys
 from PyQt5.QtWidgets import QApplication
 from frontend.main_window import MainWindow
+from frontend.perf_monitor import PerfMonitor
 from backend.core.computer import Computer
+from backend.core.sim_process import SimulatorProcess
 
 def main():
     """
@@ -13,8 +16,17 @@ def main():
     # 2. Create the PyQt Application
     app = QApplication(sys.argv)
 
-    # 3. Create the Main Window and pass the computer instance to it
-    window = MainWindow(computer)
+    # 3. Create the Main Window and pass the computer instance to it.
+    #    CAS_PERF=1 enables the performance overlay; histograms are written
+    #    to CAS_PERF_DUMP (default perf_report.json) on exit.
+    #    CAS_REMOTE=1 runs the simulator in a separate process that feeds the
+    #    window through shared memory.
+    perf = PerfMonitor() if os.environ.get("CAS_PERF") else None
+    simulator = None
+    if os.environ.get("CAS_REMOTE"):
+        simulator = SimulatorProcess()
+        simulator.start()
+    window = MainWindow(computer, perf, os.environ.get("CAS_PERF_DUMP", "perf_report.json"), simulator)
     window.show()
 
     # 4. Execute the application